@@ -63,6 +63,11 @@ def create_app():
             logger.error(f"Database initialization failed: {e}")
             # Continue running without database - use CSV fallback
     
+    # Single-service deployments can execute queued scrape jobs in-process
+    if os.environ.get("EMBEDDED_SCRAPE_WORKER", "false").lower() == "true":
+        from jobs import start_embedded_worker
+        start_embedded_worker(app)
+    
     return app
 
 # Create the app instance
@@ -93,7 +93,7 @@ def check_selenium():
         
         # Try with Chrome first
         try:
-            service = ChromeService(executable_path="/usr/local/bin/chromedriver")
+            service = ChromeService(executable_path=os.environ.get('CHROMEDRIVER_PATH', '/usr/local/bin/chromedriver'))
             driver = webdriver.Chrome(service=service, options=options)
             driver.quit()
             return True, "Successfully initialized Chrome WebDriver"
@@ -105,6 +105,17 @@ def check_selenium():
     except Exception as e:
         return False, f"Error checking Selenium: {str(e)}"
 
+def check_driver_resolution():
+    """Report the chromedriver remembered by setup_chromedriver.py, if any."""
+    try:
+        from utils.driver_pool import DRIVER_RESOLUTION_FILE, load_driver_resolution
+    except ImportError as e:
+        return False, f"Could not import the driver pool: {str(e)}"
+    binary = load_driver_resolution()
+    if binary is None:
+        return False, f"No usable resolution in {DRIVER_RESOLUTION_FILE}; run setup_chromedriver.py to create one"
+    return True, f"{binary.strategy} chromedriver at {binary.driver_path} (from {DRIVER_RESOLUTION_FILE})"
+
 def check_environment():
     """Check the environment variables and system configuration."""
     logger.info("=== Environment Check ===")
@@ -129,6 +140,11 @@ def check_environment():
     logger.info(f"ChromeDriver check: {'OK' if chromedriver_ok else 'FAILED'}")
     logger.info(f"ChromeDriver details: {chromedriver_msg}")
     
+    # Check the remembered chromedriver (informational: it is resolved on first use otherwise)
+    resolution_ok, resolution_msg = check_driver_resolution()
+    logger.info(f"Chromedriver resolution: {'OK' if resolution_ok else 'NOT CACHED'}")
+    logger.info(f"Chromedriver resolution details: {resolution_msg}")
+    
     # Check Selenium
     selenium_ok, selenium_msg = check_selenium()
     logger.info(f"Selenium check: {'OK' if selenium_ok else 'FAILED'}")
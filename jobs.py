@@ -0,0 +1,372 @@
+import os
+import json
+import time
+import socket
+import logging
+import threading
+import traceback
+from datetime import datetime, timedelta
+
+import pandas as pd
+from sqlalchemy import func, insert, update
+
+from db import db
+from models import Company, ScrapeJob, ScrapeJobEvent
+from leads import OUTPUT_COLUMNS, canonical_linkedin_url, run_scraper
+from utils.batch_classifier import get_batch_classifier
+from utils.nlp_processor import NLP_COLUMNS, analyze_record
+from utils.job_journal import new_job_id
+from utils.record_sink import MultiSink, RecordSink, job_output_path, open_file_sink
+
+logger = logging.getLogger(__name__)
+
+# A running job whose heartbeat is older than this is assumed to have lost its
+# worker and is queued again; its checkpoint journal lets it resume
+STALE_JOB_MINUTES = int(os.environ.get('SCRAPE_JOB_STALE_MINUTES', 15))
+# A job paused by an open LinkedIn circuit is held well inside that window
+# (and emits a 'paused' event, refreshing its heartbeat, while it waits)
+MAX_PAUSE_SECONDS = STALE_JOB_MINUTES * 60 // 2
+MAX_JOB_ATTEMPTS = int(os.environ.get('SCRAPE_JOB_MAX_ATTEMPTS', 3))
+POLL_INTERVAL = float(os.environ.get('SCRAPE_WORKER_POLL_SECONDS', 2.0))
+# Start the pooled browsers when a worker starts, so its first job skips Chrome startup
+DRIVER_POOL_WARMUP = os.environ.get('DRIVER_POOL_WARMUP', 'false').lower() == 'true'
+
+# Company columns that describe our outreach rather than the company; they are
+# left out when a stored company is reused as a scrape result
+OUTREACH_FIELDS = ('id', 'generated_email', 'email_sent', 'email_sent_at')
+
+# A job's output file also carries the NLP features shown on the results page
+JOB_OUTPUT_COLUMNS = OUTPUT_COLUMNS + tuple(column for column in NLP_COLUMNS if column not in OUTPUT_COLUMNS)
+# Result rows per page of /api/jobs/<job_id>, read from the job's output file
+RESULTS_PAGE_SIZE = 100
+
+# Integer Company columns; a blank cell in the results frame means unknown
+INTEGER_COMPANY_FIELDS = ('description_length', 'classification_confidence')
+
+# Companies read, classified and written back per round of reclassify_companies
+RECLASSIFY_CHUNK_SIZE = int(os.environ.get('RECLASSIFY_CHUNK_SIZE', 5000))
+
+# run_scraper arguments a client may set on a job
+SCRAPE_PARAM_KEYS = ('keywords', 'founded_years', 'country', 'size', 'max_results', 'sleep_time', 'search_backend',
+                     'lean_browser')
+
+
+def enqueue_scrape_job(params):
+    """
+    Persist a scrape request and return the queued ScrapeJob
+    """
+    job = ScrapeJob(
+        id=new_job_id(),
+        status='queued',
+        params=json.dumps({key: params[key] for key in SCRAPE_PARAM_KEYS if key in params})
+    )
+    db.session.add(job)
+    db.session.commit()
+    logger.info(f"Queued scrape job {job.id}")
+    return job
+
+
+def requeue_stale_jobs():
+    """
+    Put running jobs whose worker stopped heart-beating back in the queue
+    """
+    cutoff = datetime.now() - timedelta(minutes=STALE_JOB_MINUTES)
+    stale_jobs = ScrapeJob.query.filter(
+        ScrapeJob.status == 'running',
+        ScrapeJob.heartbeat_at < cutoff
+    ).all()
+    for job in stale_jobs:
+        if (job.attempts or 0) >= MAX_JOB_ATTEMPTS:
+            job.status = 'failed'
+            job.error = f'Worker lost {job.attempts} times; giving up'
+            job.finished_at = datetime.now()
+        else:
+            logger.warning(f"Re-queuing stale job {job.id} (last heartbeat {job.heartbeat_at})")
+            job.status = 'queued'
+    if stale_jobs:
+        db.session.commit()
+
+
+def claim_next_job(worker_id):
+    """
+    Atomically move the oldest queued job to 'running' for this worker.
+    Returns None when the queue is empty or another worker won the race.
+    """
+    requeue_stale_jobs()
+    job = ScrapeJob.query.filter_by(status='queued').order_by(ScrapeJob.created_at).first()
+    if job is None:
+        return None
+    now = datetime.now()
+    result = db.session.execute(
+        update(ScrapeJob)
+        .where(ScrapeJob.id == job.id, ScrapeJob.status == 'queued')
+        .values(
+            status='running',
+            worker_id=worker_id,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=func.coalesce(ScrapeJob.attempts, 0) + 1
+        )
+    )
+    db.session.commit()
+    if result.rowcount != 1:
+        return None
+    db.session.expire(job)
+    return job
+
+
+def _clean_record(record):
+    return {key: ('' if value is None or (isinstance(value, float) and pd.isna(value)) else value)
+            for key, value in record.items()}
+
+
+def find_fresh_companies(linkedin_urls, max_age_days):
+    """
+    Return {linkedin_url: stored company record} for the given URLs that were
+    scraped within the last ``max_age_days`` days, using a single query
+    """
+    if not linkedin_urls or not max_age_days:
+        return {}
+    cutoff = datetime.now() - timedelta(days=max_age_days)
+    rows = Company.query.filter(
+        Company.linkedin_url.in_(set(linkedin_urls)),
+        Company.scraped_at >= cutoff
+    ).all()
+    return {
+        row.linkedin_url: {key: value for key, value in row.to_dict().items() if key not in OUTREACH_FIELDS}
+        for row in rows
+    }
+
+
+def canonicalize_stored_urls():
+    """
+    Rewrite stored LinkedIn URLs to their canonical form so freshness lookups
+    and upserts match rows saved before URLs were normalized. A row is left
+    alone when its canonical URL already belongs to another row.
+    """
+    taken = {url for (url,) in db.session.query(Company.linkedin_url)}
+    updated = 0
+    for company in Company.query.all():
+        canonical = canonical_linkedin_url(company.linkedin_url)
+        if canonical and canonical != company.linkedin_url and canonical not in taken:
+            taken.discard(company.linkedin_url)
+            taken.add(canonical)
+            company.linkedin_url = canonical
+            updated += 1
+    if updated:
+        db.session.commit()
+        logger.info(f"Canonicalized {updated} stored LinkedIn URLs")
+    return updated
+
+
+def reclassify_companies(chunk_size=RECLASSIFY_CHUNK_SIZE):
+    """
+    Re-run industry classification over the whole companies table with the
+    current taxonomy. Rows are read in id order a chunk at a time, classified
+    with one batch per chunk, and domain_class, classification_confidence and
+    industry_tags of changed rows are written back with one bulk UPDATE per chunk.
+    Returns counts of companies checked and changed.
+    """
+    classifier = get_batch_classifier()
+    started = time.time()
+    checked = changed = 0
+    last_id = 0
+    while True:
+        rows = db.session.query(
+            Company.id, Company.domain, Company.name, Company.description,
+            Company.domain_class, Company.classification_confidence, Company.industry_tags
+        ).filter(Company.id > last_id).order_by(Company.id).limit(chunk_size).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        result = classifier.classify([row.domain for row in rows], [row.name for row in rows],
+                                     [row.description for row in rows])
+        updates = [
+            {'id': row.id, 'domain_class': label, 'classification_confidence': int(confidence),
+             'industry_tags': tags}
+            for row, label, confidence, tags in zip(rows, result.labels, result.confidence, result.industry_tags)
+            if (row.domain_class, row.classification_confidence, row.industry_tags) != (label, confidence, tags)
+        ]
+        if updates:
+            db.session.execute(update(Company), updates)
+            db.session.commit()
+        checked += len(rows)
+        changed += len(updates)
+    logger.info(f"Reclassified {checked} companies with taxonomy version {classifier.version}: "
+                f"{changed} changed in {time.time() - started:.1f}s")
+    return {'checked': checked, 'changed': changed, 'taxonomy_version': classifier.version}
+
+
+def save_company(company_data):
+    """
+    Insert or update one Company row from a cleaned scrape record.
+    Records reused from the database are skipped so their scraped_at stays put.
+    Returns True if the company was saved.
+    """
+    if company_data.get('scrape_path') == 'db':
+        return False
+    try:
+        url = company_data.get('companyLinkedinUrl')
+        company_data['companyLinkedinUrl'] = canonical_linkedin_url(url) or url
+        for field in INTEGER_COMPANY_FIELDS:
+            if company_data.get(field) == '':
+                company_data.pop(field)
+        existing_company = Company.query.filter_by(linkedin_url=company_data.get('companyLinkedinUrl')).first()
+        if existing_company:
+            existing_company.update_from_dict(company_data)
+            existing_company.scraped_at = datetime.now()
+        else:
+            db.session.add(Company.from_dict(company_data))
+        db.session.commit()
+        return True
+    except Exception as e:
+        logger.error(f"Error saving company to database: {e}")
+        db.session.rollback()
+        return False
+
+
+class CompanyDatabaseSink(RecordSink):
+    """
+    Saves each company as soon as the scraper finishes it, so a running job's
+    companies show up on /companies before the job completes
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def write(self, record):
+        if save_company(_clean_record(dict(record))):
+            self.count += 1
+
+
+class AnalyzingSink(MultiSink):
+    """Adds the NLP features (see process_descriptions) to each company before fanning it out"""
+
+    def write(self, record):
+        super().write(analyze_record(record))
+
+
+def run_job(job):
+    """
+    Execute a claimed job: scrape, run NLP, save companies and record the outcome.
+    Progress and events are written through a separate connection so they are
+    visible (and streamable) while the job runs. Result rows are not kept in
+    memory or on the job: they live in the job's output file (see
+    read_job_results) and in the companies table.
+    """
+    job_id = job.id
+    params = job.get_params()
+    engine = db.engine
+    jobs_table = ScrapeJob.__table__
+    events_table = ScrapeJobEvent.__table__
+
+    def on_progress(event):
+        event = dict(event)
+        event_type = event.pop('type')
+        event.pop('job_id', None)
+        now = datetime.now()
+        values = {'heartbeat_at': now}
+        if 'total' in event:
+            values['total'] = event['total']
+        if 'completed' in event:
+            values['progress'] = event['completed']
+        with engine.begin() as conn:
+            conn.execute(update(jobs_table).where(jobs_table.c.id == job_id).values(**values))
+            conn.execute(insert(events_table).values(
+                job_id=job_id, event_type=event_type, payload=json.dumps(event, default=str), created_at=now
+            ))
+
+    logger.info(f"Running scrape job {job_id} with {params}")
+    try:
+        # Companies are analyzed and streamed to the database and to this job's
+        # own output file in search-rank order; the file is published when the run ends
+        database_sink = CompanyDatabaseSink()
+        sink = AnalyzingSink([open_file_sink(job_output_path(job_id), JOB_OUTPUT_COLUMNS), database_sink])
+        df = run_scraper(**params, job_id=job_id, progress_callback=on_progress,
+                         freshness_lookup=find_fresh_companies, output_csv=None, sinks=[sink],
+                         max_pause_seconds=MAX_PAUSE_SECONDS, collect=False)
+        blocked = df.attrs.get('blocked')
+        result_count = df.attrs['result_count']
+        logger.info(f"Job {job_id}: saved {database_sink.count} of {result_count} companies")
+        # A blocked run keeps what it scraped but is reported as failed
+        job.status = 'failed' if blocked else 'completed'
+        job.error = blocked
+        job.result_count = result_count
+        job.progress = result_count
+        job.total = max(job.total or 0, result_count)
+    except Exception as e:
+        logger.error(f"Scrape job {job_id} failed: {e}")
+        logger.error(traceback.format_exc())
+        db.session.rollback()
+        job.status = 'failed'
+        job.error = str(e)
+    job.finished_at = datetime.now()
+    final_event = {'result_count': job.result_count or 0} if job.status == 'completed' else {'error': job.error}
+    db.session.add(ScrapeJobEvent(job_id=job_id, event_type=f'job_{job.status}', payload=json.dumps(final_event)))
+    db.session.commit()
+    return job
+
+
+def read_job_results(job_id, offset=0, limit=RESULTS_PAGE_SIZE):
+    """
+    One page of a finished job's result rows, in search-rank order, read from
+    its published output file; [] if the job has no output file
+    """
+    path = job_output_path(job_id)
+    if not os.path.exists(path):
+        return []
+    # Row 0 is the header, so data row i is file row i + 1. Scraped fields stay
+    # text (phone numbers, years); the NLP counts are read as numbers
+    df = pd.read_csv(path, skiprows=range(1, offset + 1), nrows=limit, keep_default_na=False,
+                     dtype={column: str for column in OUTPUT_COLUMNS})
+    return df.to_dict('records')
+
+
+def warm_driver_pool():
+    try:
+        from utils.driver_pool import get_driver_pool
+        get_driver_pool().warm_up()
+    except Exception as e:
+        logger.error(f"Driver pool warm-up failed: {e}")
+
+
+def run_worker(app, poll_interval=POLL_INTERVAL, once=False, worker_id=None, stop_event=None,
+               warm_up=DRIVER_POOL_WARMUP):
+    """
+    Poll the job table and execute jobs until stopped. With ``once`` the worker
+    exits as soon as the queue is empty. With ``warm_up`` the browser pool of
+    this process (the one that scrapes) is started in the background.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    logger.info(f"Scrape worker {worker_id} started")
+    if warm_up:
+        threading.Thread(target=warm_driver_pool, name='driver-warmup', daemon=True).start()
+    try:
+        with app.app_context():
+            canonicalize_stored_urls()
+    except Exception as e:
+        logger.error(f"Could not canonicalize stored LinkedIn URLs: {e}")
+    while not (stop_event and stop_event.is_set()):
+        job = None
+        try:
+            with app.app_context():
+                job = claim_next_job(worker_id)
+                if job is not None:
+                    run_job(job)
+        except Exception as e:
+            logger.error(f"Scrape worker error: {e}")
+            logger.error(traceback.format_exc())
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+    logger.info(f"Scrape worker {worker_id} stopped")
+
+
+def start_embedded_worker(app):
+    """
+    Run a worker thread inside the web process, for single-service deployments
+    """
+    thread = threading.Thread(target=run_worker, args=(app,), name='scrape-worker', daemon=True)
+    thread.start()
+    return thread
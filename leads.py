@@ -1,19 +1,36 @@
+import csv
 import json
+import math
+import asyncio
+import itertools
 import pandas as pd
-import requests
 import time
 import logging
 import os
-import random
 import re
+import threading
 from bs4 import BeautifulSoup
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from urllib.parse import urljoin, urlparse
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+from urllib.parse import quote, unquote, urljoin, urlparse
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from utils.analysis_cache import get_analysis_cache
+from utils.circuit_breaker import CircuitBreaker
+from utils.contact_scanner import ContactScanner
+from utils.driver_pool import FULL_PROFILE, create_chrome_driver, get_browser_profile, get_driver_pool
+from utils.http_fetcher import HTML_CONTENT_TYPES, fetch, fetch_async
+from utils.job_journal import open_journal
+from utils.linkedin_selectors import SELECTOR_VERSION, extract_from_driver, extract_from_soup
+from utils.page_cache import get_page_cache
+from utils.rate_limiter import get_rate_limiter
+from utils.record_sink import MultiSink, open_file_sink
+from utils.retry import Retrier, RetryBudget, RetryPolicy
+from utils.search_cache import get_search_cache
+from utils.taxonomy import Classification, get_taxonomy_matcher
 
 # Force logging to always print to console
 logging.basicConfig(level=logging.DEBUG, format='%(levelname)s:%(message)s')
@@ -26,538 +43,734 @@ def classify_domain(domain, company_name='', description=''):
     Enhanced domain classification that focuses on business activities rather than company names
     Uses contextual analysis to determine actual business domain
     """
-   
-    domain = (domain or '').lower()
-    company_name = (company_name or '').lower()
-    description = (description or '').lower()
-    
-    
-    primary_text = description
-    secondary_text = f"{domain} {company_name}"
-    
-    
-    industry_categories = {
-       
-        'Cloud Services': {
-            'primary': ['cloud computing', 'cloud infrastructure', 'cloud platform', 'aws services', 'azure services', 'cloud migration', 'cloud hosting', 'saas platform', 'iaas provider', 'paas solutions'],
-            'secondary': ['cloud', 'aws', 'azure', 'gcp', 'hosting', 'infrastructure'],
-            'context': ['deploy', 'scalable', 'servers', 'computing']
-        },
-        'Software Development': {
-            'primary': ['software development', 'application development', 'custom software', 'software solutions', 'mobile app development', 'web development', 'software engineering'],
-            'secondary': ['software', 'development', 'programming', 'coding', 'applications'],
-            'context': ['build', 'create', 'develop', 'engineer', 'solutions']
-        },
-        'IT Services': {
-            'primary': ['it services', 'it support', 'it consulting', 'managed it services', 'technical support', 'it infrastructure', 'network services', 'system administration'],
-            'secondary': ['it service', 'tech support', 'helpdesk', 'managed service', 'network'],
-            'context': ['support', 'maintain', 'manage', 'technical', 'systems']
-        },
-        'Cybersecurity': {
-            'primary': ['cybersecurity services', 'information security', 'security consulting', 'penetration testing', 'security audits', 'data protection', 'network security'],
-            'secondary': ['cybersecurity', 'security', 'cyber', 'protection', 'firewall'],
-            'context': ['protect', 'secure', 'threat', 'vulnerability', 'compliance']
-        },
-        'AI & Machine Learning': {
-            'primary': ['artificial intelligence', 'machine learning solutions', 'ai development', 'deep learning', 'neural networks', 'ai consulting', 'ml services'],
-            'secondary': ['ai', 'machine learning', 'artificial intelligence', 'ml', 'neural'],
-            'context': ['intelligent', 'automated', 'predictive', 'analytics', 'algorithms']
-        },
-        'Data Analytics': {
-            'primary': ['data analytics', 'business intelligence', 'data science', 'big data solutions', 'data visualization', 'analytics consulting'],
-            'secondary': ['analytics', 'data', 'big data', 'business intelligence', 'bi'],
-            'context': ['analyze', 'insights', 'reporting', 'dashboard', 'metrics']
-        },
-        
-       
-        'FinTech': {
-            'primary': ['financial technology', 'fintech solutions', 'digital payments', 'payment processing', 'digital banking', 'financial software', 'blockchain finance'],
-            'secondary': ['fintech', 'payment', 'digital payment', 'financial tech'],
-            'context': ['transactions', 'banking', 'financial', 'money', 'wallet']
-        },
-        'Financial Services': {
-            'primary': ['financial services', 'investment services', 'wealth management', 'financial planning', 'asset management', 'financial consulting'],
-            'secondary': ['financial', 'finance', 'investment', 'wealth management'],
-            'context': ['invest', 'portfolio', 'assets', 'financial planning', 'advisory']
-        },
-        'Banking': {
-            'primary': ['banking services', 'commercial banking', 'retail banking', 'private banking', 'investment banking'],
-            'secondary': ['banking', 'bank', 'loans', 'credit'],
-            'context': ['lending', 'deposits', 'accounts', 'financial institution']
-        },
-        'Insurance': {
-            'primary': ['insurance services', 'insurance brokerage', 'risk management', 'insurance consulting', 'claims management'],
-            'secondary': ['insurance', 'policy', 'coverage', 'claims'],
-            'context': ['protect', 'coverage', 'risk', 'premiums', 'underwriting']
-        },
-        
-        
-        'Real Estate': {
-            'primary': ['real estate services', 'property management', 'real estate development', 'property sales', 'commercial real estate', 'residential real estate', 'property investment'],
-            'secondary': ['real estate', 'property', 'realty', 'properties'],
-            'context': ['buy', 'sell', 'lease', 'rent', 'development', 'buildings']
-        },
-        'Property Management': {
-            'primary': ['property management services', 'facility management', 'building management', 'asset management', 'property maintenance'],
-            'secondary': ['property management', 'facility', 'building'],
-            'context': ['manage', 'maintain', 'tenants', 'leasing', 'operations']
-        },
-        'Construction': {
-            'primary': ['construction services', 'building construction', 'civil engineering', 'construction management', 'general contracting'],
-            'secondary': ['construction', 'building', 'contracting', 'engineering'],
-            'context': ['build', 'construct', 'infrastructure', 'projects', 'contractor']
-        },
-        
-       
-        'Healthcare Services': {
-            'primary': ['healthcare services', 'medical services', 'patient care', 'clinical services', 'health consulting'],
-            'secondary': ['healthcare', 'medical', 'health', 'clinical'],
-            'context': ['patients', 'treatment', 'care', 'medical', 'health']
-        },
-        'HealthTech': {
-            'primary': ['health technology', 'medical technology', 'digital health', 'telemedicine', 'health software'],
-            'secondary': ['healthtech', 'medtech', 'digital health'],
-            'context': ['medical', 'patients', 'clinical', 'healthcare', 'digital']
-        },
-        'Pharmaceutical': {
-            'primary': ['pharmaceutical services', 'drug development', 'pharmaceutical manufacturing', 'clinical research'],
-            'secondary': ['pharmaceutical', 'pharma', 'drugs', 'medicine'],
-            'context': ['research', 'development', 'clinical', 'therapeutic', 'treatments']
-        },
-        
-        
-        'Digital Marketing': {
-            'primary': ['digital marketing services', 'online marketing', 'seo services', 'social media marketing', 'content marketing', 'digital advertising'],
-            'secondary': ['digital marketing', 'marketing', 'seo', 'social media'],
-            'context': ['campaigns', 'advertising', 'promote', 'brand', 'online']
-        },
-        'Advertising': {
-            'primary': ['advertising services', 'advertising agency', 'creative advertising', 'media buying', 'brand advertising'],
-            'secondary': ['advertising', 'ads', 'marketing', 'creative'],
-            'context': ['campaigns', 'creative', 'brand', 'media', 'promotion']
-        },
-        'Public Relations': {
-            'primary': ['public relations', 'pr services', 'communications', 'media relations', 'crisis communications'],
-            'secondary': ['public relations', 'pr', 'communications', 'media'],
-            'context': ['reputation', 'communications', 'media', 'messaging', 'publicity']
-        },
-        
-       
-        'E-commerce': {
-            'primary': ['e-commerce services', 'online retail', 'e-commerce platform', 'online marketplace', 'digital commerce'],
-            'secondary': ['ecommerce', 'e-commerce', 'online store', 'retail'],
-            'context': ['online', 'selling', 'marketplace', 'shopping', 'digital']
-        },
-        'Retail': {
-            'primary': ['retail services', 'retail operations', 'consumer goods', 'retail management'],
-            'secondary': ['retail', 'store', 'shopping', 'consumer'],
-            'context': ['customers', 'sales', 'products', 'shopping', 'goods']
-        },
-        
-        
-        'Consulting': {
-            'primary': ['consulting services', 'business consulting', 'management consulting', 'strategic consulting', 'advisory services'],
-            'secondary': ['consulting', 'consultancy', 'advisory', 'consulting'],
-            'context': ['advice', 'strategy', 'solutions', 'expertise', 'guidance']
-        },
-        'Legal Services': {
-            'primary': ['legal services', 'law firm', 'legal consulting', 'litigation services', 'corporate law'],
-            'secondary': ['legal', 'law', 'attorney', 'lawyer'],
-            'context': ['legal', 'law', 'litigation', 'contracts', 'compliance']
-        },
-        'Accounting': {
-            'primary': ['accounting services', 'financial accounting', 'tax services', 'bookkeeping', 'audit services'],
-            'secondary': ['accounting', 'tax', 'bookkeeping', 'audit'],
-            'context': ['financial', 'taxes', 'books', 'compliance', 'reporting']
-        },
-        
-       
-        'Manufacturing': {
-            'primary': ['manufacturing services', 'industrial manufacturing', 'production services', 'contract manufacturing'],
-            'secondary': ['manufacturing', 'production', 'industrial', 'factory'],
-            'context': ['produce', 'manufacture', 'assembly', 'industrial', 'products']
-        },
-        'Logistics': {
-            'primary': ['logistics services', 'supply chain', 'transportation', 'shipping services', 'warehousing'],
-            'secondary': ['logistics', 'supply chain', 'shipping', 'transport'],
-            'context': ['deliver', 'transport', 'warehouse', 'distribution', 'supply']
-        },
-        
-       
-        'Education': {
-            'primary': ['educational services', 'training services', 'e-learning', 'corporate training', 'educational technology'],
-            'secondary': ['education', 'training', 'learning', 'teaching'],
-            'context': ['learn', 'teach', 'students', 'courses', 'knowledge']
-        },
-        'EdTech': {
-            'primary': ['educational technology', 'e-learning platform', 'online education', 'learning management'],
-            'secondary': ['edtech', 'e-learning', 'educational tech'],
-            'context': ['learning', 'education', 'students', 'online', 'platform']
-        }
-    }
-    
-    # Enhanced scoring algorithm
-    def calculate_industry_score(industry_data, text_primary, text_secondary):
-        score = 0
-        matches = []
-        
-        # Primary indicators (business activities) - High weight
-        for indicator in industry_data['primary']:
-            if indicator in text_primary:
-                score += 10  # High score for business activity match
-                matches.append(f"Primary: {indicator}")
-                
-                # Bonus for multiple word phrases
-                if len(indicator.split()) > 1:
-                    score += 5
-        
-        # Secondary indicators - Medium weight
-        for indicator in industry_data['secondary']:
-            if indicator in text_primary:
-                score += 5  # Medium score for description match
-                matches.append(f"Secondary: {indicator}")
-            elif indicator in text_secondary:
-                score += 2  # Lower score for name/domain match
-                matches.append(f"Name: {indicator}")
-        
-        # Context validation - Bonus points
-        context_matches = 0
-        for context in industry_data['context']:
-            if context in text_primary:
-                context_matches += 1
-                matches.append(f"Context: {context}")
-        
-        # Context bonus (validates the industry match)
-        if context_matches > 0:
-            score += context_matches * 3
-        
-        # Penalty for name-only matches without business context
-        name_only_matches = sum(1 for match in matches if match.startswith("Name:"))
-        business_matches = sum(1 for match in matches if match.startswith("Primary:"))
-        
-        if name_only_matches > 0 and business_matches == 0:
-            score = max(0, score - 5)  # Reduce score for name-only matches
-        
-        return score, matches
-    
-    # Calculate scores for all industries
-    industry_scores = {}
-    for industry, data in industry_categories.items():
-        score, matches = calculate_industry_score(data, primary_text, secondary_text)
-        if score > 0:
-            industry_scores[industry] = {
-                'score': score,
-                'matches': matches,
-                'confidence': min(100, score * 5)  # Convert to percentage
-            }
-    
-    # Find best match with minimum threshold
-    if industry_scores:
-        best_industry = max(industry_scores.items(), key=lambda x: x[1]['score'])
-        industry_name, industry_info = best_industry
-        
-        # Only return classification if confidence is high enough
-        if industry_info['score'] >= 8:  # Minimum threshold for classification
-            logger.debug(f"Classified as {industry_name} (score: {industry_info['score']}, matches: {industry_info['matches']})")
-            return industry_name
-    
-    
-    general_categories = {
-        'Technology': ['tech', 'digital', 'software', 'computer', 'it', 'automation', 'innovation'],
-        'Business Services': ['services', 'solutions', 'consulting', 'management', 'business'],
-        'Finance': ['financial', 'money', 'capital', 'investment', 'banking', 'insurance'],
-        'Healthcare': ['health', 'medical', 'care', 'wellness', 'clinical', 'patient'],
-        'Manufacturing': ['manufacturing', 'production', 'industrial', 'factory', 'assembly'],
-        'Retail': ['retail', 'store', 'shop', 'consumer', 'sales', 'merchandise']
-    }
-    
-    for category, keywords in general_categories.items():
-        category_score = sum(3 if kw in primary_text else 1 if kw in secondary_text else 0 for kw in keywords)
-        if category_score >= 5:
-            logger.debug(f"General classification: {category} (score: {category_score})")
-            return category
-    
-    logger.debug("No classification found - returning 'Other'")
-    return 'Other'
+    return classify_company(domain, company_name, description).label
 
+def classify_company(domain, company_name='', description=''):
+    """
+    Like classify_domain, but also returns the winning score, a 0-100
+    confidence and the best-scoring industries from the same pass.
+    Memoized per taxonomy, so an unchanged company is not scored again.
+    """
+    matcher = get_taxonomy_matcher()
+    value = get_analysis_cache().memoize(
+        'classification', (matcher.version, matcher.fingerprint, description, company_name, domain),
+        lambda: list(matcher.classify_company(domain, company_name, description))
+    )
+    return Classification.from_value(value)
+
+def canonical_linkedin_url(url):
+    """
+    Normalize a LinkedIn company URL to https://www.linkedin.com/company/<slug>.
+    Country subdomains, sub-pages like /about or /jobs, query strings, case and
+    trailing slashes all map to the same URL. Returns None for anything that is
+    not a company page.
+    """
+    if not url:
+        return None
+    url = url.strip()
+    parsed = urlparse(url if '://' in url else f'https://{url}')
+    host = (parsed.hostname or '').lower()
+    if host != 'linkedin.com' and not host.endswith('.linkedin.com'):
+        return None
+    segments = [unquote(segment) for segment in parsed.path.split('/') if segment]
+    if len(segments) < 2 or segments[0].lower() != 'company':
+        return None
+    slug = segments[1].strip().lower()
+    return f'https://www.linkedin.com/company/{quote(slug)}' if slug else None
+
+def dedupe_companies(companies):
+    """
+    Canonicalize each company's LinkedIn URL and drop repeats, keeping the first
+    (highest ranked) occurrence
+    """
+    seen = set()
+    unique = []
+    for company in companies:
+        url = canonical_linkedin_url(company.get('companyLinkedinUrl')) or company.get('companyLinkedinUrl')
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        unique.append({**company, 'companyLinkedinUrl': url})
+    if len(unique) < len(companies):
+        logger.info(f"Dropped {len(companies) - len(unique)} duplicate company URLs")
+    return unique
 
+GOOGLE_SEARCH_URL = 'https://www.google.com/search'
+# googlesearch moves on by this many results per page request
+GOOGLE_PAGE_SIZE = 10
 
-def scrape_companies_google(query, max_results=10):
+def scrape_companies_google(query, max_results=10, cache=None, fallback=True, rate_limiter=None):
     """
-    Scrape companies using Google search for LinkedIn company pages
+    Scrape companies using Google search for LinkedIn company pages.
+    With a ``cache``, a fresh earlier result list for the same query is reused
+    and only the missing tail is fetched, resuming at the remembered result
+    offset; if Google fails, the cached list is used even when stale. Without
+    ``fallback`` a failed search returns an empty list instead of test URLs.
+    A google.com token of ``rate_limiter`` is taken before each page of
+    results is requested, so cache hits are never throttled.
     """
-    companies = []
+    search_query = f'site:linkedin.com/company {query}'
+    entry = cache.load(search_query) if cache is not None else None
+    fresh = entry is not None and not entry['stale']
+    urls = list(entry['urls']) if fresh else []
+    offset = entry['next_offset'] if fresh else 0
+    if fresh and (len(urls) >= max_results or entry['exhausted']):
+        cache.record(hit=True)
+        logger.info(f"Using {min(len(urls), max_results)} cached LinkedIn company URLs for: {search_query}")
+        return [{'companyLinkedinUrl': url} for url in urls[:max_results]]
+    if cache is not None:
+        cache.record(hit=False)
+
+    exhausted = False
+    error = None
     try:
         from googlesearch import search
         # Search for LinkedIn company pages
-        search_query = f'site:linkedin.com/company {query}'
-        logger.info(f"Searching Google for: {search_query}")
-        urls = []
-        # Use only supported arguments for googlesearch version
-        for url in search(search_query, num_results=max_results * 3):
-            if 'linkedin.com/company' in url and len(urls) < max_results * 2:
-                urls.append(url)
-        logger.info(f"Found {len(urls)} LinkedIn company URLs")
-        for i, url in enumerate(urls[:max_results]):
-            companies.append({'companyLinkedinUrl': url})
+        logger.info(f"Searching Google for: {search_query} (from result {offset})")
+        wanted = max_results - len(urls)
+        budget = wanted * 3
+        consumed = 0
+        # googlesearch counts num_results from 0 whatever start_num is, and sizes
+        # its pages as num_results - start_num, so the total stays absolute and
+        # the loop is capped here to only ever read the new tail
+        results = search(search_query, num_results=offset + budget, start_num=offset)
+        while consumed < budget:
+            # The generator requests the next page when the previous one is used up
+            if rate_limiter is not None and consumed % GOOGLE_PAGE_SIZE == 0:
+                rate_limiter.acquire(GOOGLE_SEARCH_URL)
+            url = next(results, None)
+            if url is None:
+                exhausted = True
+                break
+            consumed += 1
+            # Different country subdomains and sub-pages of one company count once
+            canonical = canonical_linkedin_url(url)
+            if canonical and canonical not in urls:
+                urls.append(canonical)
+                if len(urls) >= max_results:
+                    break
+        offset += consumed
     except Exception as e:
+        error = e
         logger.error(f"Error in Google search: {e}")
+
+    if cache is not None and (error is None or len(urls) > len(entry['urls'] if fresh else [])):
+        cache.save(search_query, urls, offset, exhausted)
+    if error is not None and not urls and entry is not None and entry['urls']:
+        logger.warning(f"Google search failed; using {len(entry['urls'])} cached URLs from an earlier search")
+        urls = list(entry['urls'])
+    if error is not None and not urls and fallback:
         # Fallback: Use hardcoded LinkedIn company URLs for testing Selenium
         urls = [
-            "https://uk.linkedin.com/company/microsoft",
-            "https://uk.linkedin.com/company/google",
-            "https://uk.linkedin.com/company/amazon"
+            "https://www.linkedin.com/company/microsoft",
+            "https://www.linkedin.com/company/google",
+            "https://www.linkedin.com/company/amazon"
         ]
         logger.warning(f"Using fallback LinkedIn URLs: {urls[:max_results]}")
-        for url in urls[:max_results]:
-            companies.append({'companyLinkedinUrl': url})
-    return companies
+    logger.info(f"Found {len(urls[:max_results])} LinkedIn company URLs")
+    return [{'companyLinkedinUrl': url} for url in urls[:max_results]]
+
+class SearchBackend:
+    """
+    Source of LinkedIn company candidates. ``search`` returns up to
+    ``max_results`` company dicts, each with a 'companyLinkedinUrl'.
+    """
+    name = 'base'
+
+    def search(self, query, max_results):
+        raise NotImplementedError
+
+class GoogleSearchBackend(SearchBackend):
+    """
+    Google 'site:linkedin.com/company' search, with the per-query result cache.
+    Concurrent sub-queries share the google.com token bucket of ``rate_limiter``,
+    which is only drawn on for pages actually requested from Google.
+    """
+    name = 'google'
+
+    def __init__(self, cache=None, rate_limiter=None):
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+
+    def search(self, query, max_results):
+        return scrape_companies_google(query, max_results, cache=self.cache, fallback=False,
+                                       rate_limiter=self.rate_limiter)
+
+class FileSearchBackend(SearchBackend):
+    """
+    Offline backend over a fixture file: a JSON list (of URLs or company
+    dicts), a CSV with a companyLinkedinUrl column (e.g. an earlier lead1.csv)
+    or a text file with one URL per line. Records are ranked by how many query
+    words appear in their other fields; bare URLs match every query.
+    """
+    name = 'file'
+
+    def __init__(self, path):
+        self.path = path
+        self._records = None
+
+    def _load(self):
+        if self._records is None:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                if self.path.endswith('.json'):
+                    records = json.load(f)
+                elif self.path.endswith('.csv'):
+                    records = list(csv.DictReader(f))
+                else:
+                    records = [line.strip() for line in f if line.strip()]
+            self._records = [
+                record if isinstance(record, dict) else {'companyLinkedinUrl': record}
+                for record in records
+            ]
+        return self._records
+
+    def search(self, query, max_results):
+        terms = [term for term in query.lower().split() if not term.startswith('site:')]
+        ranked = []
+        for position, record in enumerate(self._load()):
+            if not record.get('companyLinkedinUrl'):
+                continue
+            text = ' '.join(str(value) for key, value in record.items()
+                            if key != 'companyLinkedinUrl' and value).lower()
+            score = sum(1 for term in terms if term in text) if text else 0
+            if score or not text or not terms:
+                ranked.append((-score, position, record))
+        ranked.sort(key=lambda item: item[:2])
+        return [dict(record) for _, _, record in ranked[:max_results]]
+
+# Words plan_search_queries adds for Google that stored fields never contain
+QUERY_NOISE_WORDS = {'founded', 'employees'}
+
+class DatabaseSearchBackend(SearchBackend):
+    """
+    Companies already stored in the database whose text fields contain every
+    word of the query. Needs a Flask app, either passed
+    in or taken from the active app context when the backend is created.
+    """
+    name = 'db'
+
+    def __init__(self, app=None):
+        from flask import current_app
+        self.app = app or current_app._get_current_object()
+
+    def search(self, query, max_results):
+        from sqlalchemy import or_
+        from models import Company
+        terms = [term for term in query.lower().split()
+                 if len(term) > 2 and term not in QUERY_NOISE_WORDS and not term.startswith('site:')]
+        if not terms:
+            return []
+        columns = (Company.name, Company.description, Company.domain_class, Company.keywords,
+                   Company.location, Company.size, Company.founded)
+        with self.app.app_context():
+            rows = (Company.query
+                    .filter(Company.linkedin_url.isnot(None), Company.linkedin_url != '')
+                    .filter(*[or_(*[column.ilike(f'%{term}%') for column in columns]) for term in terms])
+                    .order_by(Company.scraped_at.desc())
+                    .limit(max_results)
+                    .all())
+            return [{'companyLinkedinUrl': row.linkedin_url} for row in rows]
+
+SEARCH_BACKENDS = ('google', 'file', 'db')
+
+def get_search_backend(backend=None, config=None):
+    """
+    Resolve a backend name ('google', 'file' or 'db'; default from the
+    'search_backend' config key) or pass a SearchBackend instance through
+    """
+    config = config or {}
+    if isinstance(backend, SearchBackend):
+        return backend
+    name = (backend or config.get('search_backend') or 'google').lower()
+    if name == 'google':
+        return GoogleSearchBackend(cache=get_search_cache(config.get('search_cache')), rate_limiter=shared_rate_limiter(config))
+    if name == 'file':
+        path = config.get('search_fixture')
+        if not path:
+            raise ValueError("The 'file' search backend needs 'search_fixture' in the scraper config")
+        return FileSearchBackend(path)
+    if name == 'db':
+        return DatabaseSearchBackend()
+    raise ValueError(f"Unknown search backend {backend!r}; expected one of {', '.join(SEARCH_BACKENDS)}")
+
+def plan_search_queries(keywords, founded_years=None, size=None, country=None, max_queries=12):
+    """
+    Expand a search into sub-queries. Each comma-separated keyword is searched
+    on its own first (with the country, as the single query used to be), then
+    refined by every founded year × size combination.
+    """
+    keyword_list = [keyword.strip() for keyword in (keywords or '').split(',') if keyword.strip()] or ['']
+    years = [str(year).strip() for year in (founded_years or []) if str(year).strip()]
+    sizes = [part.strip() for part in (size or '').split(',') if part.strip() and part.strip().lower() != 'any']
+    suffix = f" {country}" if country and country.lower() != 'all countries' else ''
+    queries = [f"{keyword}{suffix}".strip() for keyword in keyword_list]
+    if years or sizes:
+        for keyword in keyword_list:
+            for year in years or [None]:
+                for company_size in sizes or [None]:
+                    parts = [keyword]
+                    if year:
+                        parts.append(f"founded {year}")
+                    if company_size:
+                        parts.append(f"{company_size} employees")
+                    queries.append(f"{' '.join(parts)}{suffix}".strip())
+    planned = []
+    for query in queries:
+        if query and query not in planned:
+            planned.append(query)
+    return planned[:max_queries]
+
+def fan_out_search(backend, queries, max_results, workers=3):
+    """
+    Run the sub-queries concurrently and merge their candidates in plan order,
+    deduplicated by canonical LinkedIn URL, up to ``max_results``
+    """
+    if not queries:
+        return []
+    # Sub-queries overlap, so ask each for a share with some headroom
+    per_query = min(max_results, max(10, math.ceil(2 * max_results / len(queries))))
+
+    def run(query):
+        try:
+            return backend.search(query, per_query)
+        except Exception as e:
+            logger.error(f"Search backend '{backend.name}' failed for {query!r}: {e}")
+            return []
+
+    if workers > 1 and len(queries) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(queries))) as executor:
+            result_lists = list(executor.map(run, queries))
+    else:
+        result_lists = [run(query) for query in queries]
+    merged = dedupe_companies([company for results in result_lists for company in results])
+    logger.info(f"{len(queries)} {backend.name} sub-queries returned {len(merged)} unique companies")
+    return merged[:max_results]
+
+def iter_candidate_batches(keywords, founded_years=None, country=None, size=None, max_results=10,
+                           config=None, search_func=None, search_backend=None, max_rounds=3):
+    """
+    Lazily yield candidate companies in search rounds: the first round asks for
+    ``max_results`` companies and each later one for twice as many as the round
+    before (the search cache turns a wider repeat into a fetch of the new tail
+    only). A custom ``search_func`` cannot be widened and yields one round.
+    """
+    config = config or {}
+    if search_func is not None:
+        logger.info("Step 1: Searching with a custom search function...")
+        search_query = f"{keywords}"
+        if country and country.lower() != 'all countries':
+            search_query += f" {country}"
+        yield dedupe_companies(search_func(search_query))
+        return
+    backend = get_search_backend(search_backend, config)
+    queries = plan_search_queries(
+        keywords, founded_years, size, country, max_queries=config.get('search_max_queries', 12)
+    )
+    width = max_results
+    for round_number in range(1, max_rounds + 1):
+        logger.info(f"Step 1: Searching {backend.name} with {len(queries)} sub-queries "
+                    f"(round {round_number}, up to {width} companies)...")
+        yield fan_out_search(backend, queries, width, workers=config.get('search_workers', 3))
+        width *= 2
+
+# Names a headquarters line may use for a country. Only countries listed here
+# can cause a rejection: a location naming none of them is treated as unknown.
+COUNTRY_ALIASES = {
+    'united kingdom': ('united kingdom', 'uk', 'u.k.', 'great britain', 'britain', 'england', 'scotland', 'wales', 'northern ireland'),
+    'united states': ('united states', 'united states of america', 'usa', 'u.s.a.', 'u.s.', 'us'),
+    'canada': ('canada',),
+    'australia': ('australia',),
+    'new zealand': ('new zealand',),
+    'ireland': ('ireland', 'republic of ireland'),
+    'india': ('india',),
+    'germany': ('germany', 'deutschland'),
+    'france': ('france',),
+    'netherlands': ('netherlands', 'the netherlands', 'holland'),
+    'spain': ('spain',),
+    'italy': ('italy',),
+    'sweden': ('sweden',),
+    'switzerland': ('switzerland',),
+    'singapore': ('singapore',),
+    'united arab emirates': ('united arab emirates', 'uae', 'dubai', 'abu dhabi'),
+    'south africa': ('south africa',),
+    'brazil': ('brazil',),
+    'japan': ('japan',),
+    'china': ('china',)
+}
+
+
+def _country_key(name):
+    """Canonical COUNTRY_ALIASES key for a country name or alias, or None if unknown"""
+    name = ' '.join((name or '').lower().split())
+    for key, aliases in COUNTRY_ALIASES.items():
+        if name == key or name in aliases:
+            return key
+    return None
+
+
+def _mentions(text, alias):
+    return re.search(r'(?<![a-z])' + re.escape(alias) + r'(?![a-z])', text) is not None
+
+
+def location_countries(location):
+    """Canonical countries mentioned in a location string"""
+    text = (location or '').lower()
+    # 'Northern Ireland' must not also count as the Republic of Ireland
+    text_without_ni = text.replace('northern ireland', '')
+    return {
+        key for key, aliases in COUNTRY_ALIASES.items()
+        if any(_mentions(text_without_ni if key == 'ireland' else text, alias) for alias in aliases)
+    }
+
+
+def _size_range(text):
+    """(low, high) employee range from '51-200', '51-200 employees', '10,001+ employees'; None if unparseable"""
+    numbers = [int(n.replace(',', '')) for n in re.findall(r'\d[\d,]*', str(text or ''))]
+    if not numbers:
+        return None
+    if '+' in str(text) or len(numbers) == 1:
+        return numbers[0], (math.inf if '+' in str(text) else numbers[0])
+    return numbers[0], numbers[1]
+
+
+def matches_criteria(company, founded_years=None, country=None, size=None):
+    """
+    Check one scraped company against the search criteria.
+
+    Returns (True, '') or (False, reason). Missing or unparseable data never
+    rejects a company: only a founded year outside ``founded_years``, a
+    location naming a different country, or a size range that does not
+    overlap the requested one does.
+    """
+    if founded_years:
+        match = re.search(r'\d{4}', str(company.get('founded') or ''))
+        if match and match.group() not in [str(year).strip() for year in founded_years]:
+            return False, f"founded {match.group()}"
+
+    if country and country.lower() != 'all countries':
+        found = location_countries(company.get('location'))
+        wanted = _country_key(country)
+        if wanted is None:
+            # A country without aliases falls back to a plain substring test
+            location = (company.get('location') or '').lower()
+            if found and country.lower() not in location:
+                return False, f"located in {company.get('location')}"
+        elif found and wanted not in found:
+            return False, f"located in {company.get('location')}"
+
+    if size and size != 'Any':
+        wanted_range = _size_range(size)
+        company_range = _size_range(company.get('size'))
+        if wanted_range and company_range and (
+                company_range[1] < wanted_range[0] or company_range[0] > wanted_range[1]):
+            return False, f"size {company.get('size')}"
+
+    return True, ''
+
 
 def filter_by_criteria(companies, founded_years=None, country=None, size=None):
     """
     Filter companies based on specified criteria
     """
-    filtered_companies = []
+    return [
+        company for company in companies
+        if matches_criteria(company, founded_years=founded_years, country=country, size=size)[0]
+    ]
+
+EXCLUDED_EMAILS = ['noreply@', 'no-reply@', 'donotreply@']
+PRIORITY_EMAIL_WORDS = ['contact', 'info', 'hello', 'support']
+# Contact details sit near the top of a page; anything past this is not read
+CONTACT_PAGE_MAX_BYTES = 1024 * 1024
+
+def contact_page_urls(website_url):
+    """
+    Candidate pages to search for contact details, in order of preference
+    """
+    if not website_url.startswith(('http://', 'https://')):
+        website_url = 'https://' + website_url
+    return [
+        website_url,
+        urljoin(website_url, '/contact'),
+        urljoin(website_url, '/contact-us'),
+        urljoin(website_url, '/about'),
+        urljoin(website_url, '/about-us')
+    ]
+
+CONTACT_PAGE_COUNT = len(contact_page_urls('example.com'))
+
+def pick_email(contacts):
+    """
+    Return (email, is_priority) for the best contact email among scanned
+    Contacts, or ('', False). mailto: links rank ahead of addresses in the text.
+    """
+    emails = contacts.mailto_emails + [email for email in contacts.emails if email not in contacts.mailto_emails]
     
-    for company in companies:
-        # Check founded year criteria
-        if founded_years:
-            company_founded = company.get('founded', '')
-            if company_founded:
-                try:
-                    founded_year = int(re.search(r'\d{4}', str(company_founded)).group())
-                    if str(founded_year) not in [str(year) for year in founded_years]:
-                        continue
-                except:
-                    pass
-        
-        # Check country criteria
-        if country and country.lower() != 'all countries':
-            company_location = company.get('location', '').lower()
-            if country.lower() not in company_location:
-                continue
-        
-        # Check size criteria
-        if size and size != 'Any':
-            company_size = company.get('size', '')
-            if size not in company_size:
-                continue
-        
-        filtered_companies.append(company)
+    # Filter out common non-contact emails
+    valid_emails = [email for email in emails if not any(excluded in email for excluded in EXCLUDED_EMAILS)]
+    if not valid_emails:
+        return '', False
     
-    return filtered_companies
+    # Prefer contact, info, or hello emails
+    priority_emails = [email for email in valid_emails if any(word in email for word in PRIORITY_EMAIL_WORDS)]
+    if priority_emails:
+        return priority_emails[0], True
+    return valid_emails[0], False
 
-def extract_contact_info(website_url, company_name):
+def pick_phone(contacts):
     """
-    Extract contact information from company website
+    Best phone number among scanned Contacts: tel: links first, then numbers in the text
+    """
+    phones = contacts.tel_phones or contacts.phones
+    return phones[0] if phones else ''
+
+async def extract_contact_info_async(website_url, company_name, timeout=10, cache=None, rate_limiter=None):
+    """
+    Fetch all candidate contact pages of one website concurrently. fetch_async
+    runs each blocking request on the shared http_fetcher thread pool, so the
+    pages of a site overlap; different companies overlap because run_scraper
+    processes them on several worker threads. Each page is fed to a
+    ContactScanner as it downloads. The first priority email wins: its page
+    stops reading there, and a shared stop event closes the other pages'
+    connections at their next chunk and keeps queued fetches from being sent
+    (or spending rate-limit tokens). Otherwise the email from the most
+    preferred page is used. Pages in ``cache`` are read from disk without
+    touching the network or ``rate_limiter``.
     """
     contact_info = {'email': '', 'phone': '', 'contact_person': ''}
     
     if not website_url:
         return contact_info
     
-    try:
-        # Clean and validate URL
-        if not website_url.startswith(('http://', 'https://')):
-            website_url = 'https://' + website_url
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        # Try to find contact page first
-        contact_urls = [
-            website_url,
-            urljoin(website_url, '/contact'),
-            urljoin(website_url, '/contact-us'),
-            urljoin(website_url, '/about'),
-            urljoin(website_url, '/about-us')
-        ]
-        
-        for url in contact_urls:
-            try:
-                response = requests.get(url, headers=headers, timeout=10)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Extract emails
-                    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-                    emails = re.findall(email_pattern, response.text, re.IGNORECASE)
-                    
-                    # Filter out common non-contact emails
-                    excluded_emails = ['noreply@', 'no-reply@', 'donotreply@']
-                    valid_emails = [email for email in emails if not any(excluded in email.lower() for excluded in excluded_emails)]
-                    
-                    if valid_emails:
-                        # Prefer contact, info, or hello emails
-                        priority_emails = [email for email in valid_emails if any(word in email.lower() for word in ['contact', 'info', 'hello', 'support'])]
-                        contact_info['email'] = priority_emails[0] if priority_emails else valid_emails[0]
-                        break
-                
-            except Exception as e:
-                logger.debug(f"Error extracting from {url}: {e}")
-                continue
+    urls = contact_page_urls(website_url)
+    stop = threading.Event()
     
+    async def probe(index, url):
+        scanner = ContactScanner()
+
+        def on_text(chunk):
+            # Runs on the fetch thread; a priority email ends every page of this site
+            scanner.feed(chunk)
+            if pick_email(scanner.contacts())[1]:
+                stop.set()
+                return True
+            return False
+
+        try:
+            # Capped, HTML-only download so a huge page or a stray PDF costs little
+            response = await fetch_async(url, timeout=timeout, cache=cache, rate_limiter=rate_limiter,
+                                         max_bytes=CONTACT_PAGE_MAX_BYTES, content_types=HTML_CONTENT_TYPES,
+                                         on_text=on_text, stop_event=stop)
+            if response.status_code == 200:
+                contacts = scanner.result()
+                return index, pick_email(contacts), pick_phone(contacts)
+        except Exception as e:
+            logger.debug(f"Error extracting from {url}: {e}")
+        return index, ('', False), ''
+    
+    tasks = [asyncio.ensure_future(probe(i, url)) for i, url in enumerate(urls)]
+    found = {}
+    phones = {}
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, (email, is_priority), phone = await next_done
+            if phone:
+                phones[index] = phone
+            if is_priority:
+                contact_info['email'] = email
+                break
+            if email:
+                found[index] = email
     except Exception as e:
         logger.debug(f"Error extracting contact info: {e}")
+    finally:
+        stop.set()
+        for task in tasks:
+            task.cancel()
     
+    if found and not contact_info['email']:
+        contact_info['email'] = found[min(found)]
+    if phones:
+        contact_info['phone'] = phones[min(phones)]
     return contact_info
 
-def scrape_linkedin_company_page(url, user_agent='Mozilla/5.0', timeout=20):
+def extract_contact_info(website_url, company_name, cache=None, rate_limiter=None):
     """
-    Scrape a LinkedIn company page using a robust, undetectable headless Selenium setup.
+    Extract contact information from company website. Blocks the calling
+    (worker) thread while the site's pages are fetched in parallel.
+    """
+    return asyncio.run(extract_contact_info_async(website_url, company_name, cache=cache, rate_limiter=rate_limiter))
+
+AUTH_WALL_MARKERS = ('/authwall', '/login', '/uas/login', '/checkpoint', '/signup')
+BLOCKED_STATUS_CODES = (401, 403, 429, 999)
+
+# Fields the HTTP fast path must find itself; otherwise Selenium renders the page
+HTTP_REQUIRED_FIELDS = ('name', 'description')
+HTTP_DETAIL_FIELDS = ('website', 'size', 'location', 'founded')
+
+def is_auth_wall(final_url, status_code=200):
+    """
+    True when LinkedIn answered with a login/auth wall instead of the company page
     """
-    logging.info(f"[Selenium] Starting headless browser for {url}")
+    path = urlparse(final_url or '').path.lower()
+    return status_code in BLOCKED_STATUS_CODES or any(marker in path for marker in AUTH_WALL_MARKERS)
+
+def parse_linkedin_company_html(html):
+    """
+    Extract company fields from server-rendered LinkedIn company page HTML
+    """
+    return extract_from_soup(BeautifulSoup(html, 'html.parser'))
+
+def make_company_record(url, fields, scrape_path):
+    """
+    Build the scraped-company row shared by the HTTP and Selenium paths
+    """
+    # Domain from URL
+    domain = url.split('/')[4] if len(url.split('/')) > 4 else ''
+    name = fields.get('name', '')
+    desc = fields.get('description', '')
+    # Use improved domain classification with multiple data points
+    classification = classify_company(domain, name, desc)
+    return {
+        'companyLinkedinUrl': url,
+        'name': name,
+        'description': desc,
+        'website': fields.get('website', ''),
+        'domain': domain,
+        'domain_class': classification.label,
+        'classification_confidence': classification.confidence,
+        'industry_tags': classification.industry_tags,
+        'size': fields.get('size', ''),
+        'location': fields.get('location', ''),
+        'founded': fields.get('founded', ''),
+        'scrape_path': scrape_path,
+        'scraped_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def missing_company_fields(fields):
+    """
+    Names of the fields a parsed company page lacks before it can be used as-is
+    """
+    missing = [field for field in HTTP_REQUIRED_FIELDS if not fields[field]]
+    if not any(fields[field] for field in HTTP_DETAIL_FIELDS):
+        missing.append('details')
+    return missing
+
+def scrape_linkedin_company_http(url, user_agent='Mozilla/5.0', timeout=20, cache=None, rate_limiter=None):
+    """
+    Fast path: fetch the public company page over plain HTTP and parse the
+    server-rendered HTML. Returns an 'error' dict (with 'auth_wall' and any
+    'partial' fields) when the page is walled or too incomplete to use.
+    Only complete pages are written to ``cache``.
+    """
+    try:
+        response = fetch(url, timeout=timeout, headers={
+            'User-Agent': user_agent,
+            'Accept-Language': 'en-US,en;q=0.9'
+        }, rate_limiter=rate_limiter)
+    except Exception as e:
+        return {'error': f'HTTP fetch failed: {e}', 'auth_wall': False}
     
-    # Initialize Chrome options
-    options = Options()
+    if is_auth_wall(response.final_url, response.status_code):
+        return {'error': f'LinkedIn auth wall (HTTP {response.status_code}, {response.final_url})', 'auth_wall': True}
+    if response.status_code != 200:
+        return {'error': f'HTTP {response.status_code}', 'auth_wall': False}
     
-    # Set Chrome binary path from environment if available
-    chrome_bin = os.environ.get('CHROME_BIN', '/usr/bin/google-chrome')
-    options.binary_location = chrome_bin
+    fields = parse_linkedin_company_html(response.text)
+    missing = missing_company_fields(fields)
+    if missing:
+        return {
+            'error': f"HTTP page missing {', '.join(missing)}",
+            'auth_wall': False,
+            'partial': fields if fields['name'] else None
+        }
+    logger.info(f"[HTTP] Scraped {url} without a browser: {fields['name']}")
+    if cache is not None:
+        cache.put(url, response.text, response.status_code, response.final_url)
+    return make_company_record(url, fields, scrape_path='http')
+
+# A crashed browser or a page-load timeout gets one more try on a fresh pooled
+# browser; auth walls and missing fields are not retried. The small budget keeps
+# a broken Chrome setup from doubling every page load.
+SELENIUM_RETRIER = Retrier(
+    'selenium',
+    result_policy=RetryPolicy(max_attempts=2, base_delay=1.0, max_delay=4.0),
+    budget=RetryBudget(ratio=0.2, min_per_second=0.05, max_tokens=3)
+)
+
+def scrape_company_page(url, user_agent='Mozilla/5.0', timeout=20, driver_pool=None, http_first=True,
+                        rate_limiter=None, cache=None):
+    """
+    Scrape a LinkedIn company page: a fresh copy in the page cache wins, then
+    the HTTP fast path, and a browser is only borrowed when the page is walled
+    or missing fields. The returned row's 'scrape_path' says which path served it.
+    """
+    if cache is not None:
+        entry = cache.get(url)
+        if entry is not None:
+            fields = parse_linkedin_company_html(entry['text'])
+            if not missing_company_fields(fields):
+                logger.info(f"[Cache] Served {url} from the page cache")
+                return make_company_record(url, fields, scrape_path='cache')
     
-    # Basic Chrome options
-    options.add_argument('--headless=new')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--disable-software-rasterizer')
-    options.add_argument('--disable-extensions')
-    options.add_argument('--disable-blink-features=AutomationControlled')
-    options.add_argument('--disable-infobars')
-    options.add_argument('--disable-notifications')
-    options.add_argument('--window-size=1920,1080')
-    options.add_argument('--start-maximized')
-    options.add_argument('--disable-web-security')
-    options.add_argument('--allow-running-insecure-content')
-    options.add_argument('--disable-setuid-sandbox')
-    options.add_argument('--disable-browser-side-navigation')
-    options.add_argument('--disable-client-side-phishing-detection')
-    options.add_argument('--disable-component-update')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-features=IsolateOrigins,site-per-process')
-    options.add_argument('--ignore-certificate-errors')
-    options.add_argument('--log-level=3')
-    options.add_argument('--output=/dev/null')
-    options.add_argument('--remote-debugging-port=9222')
-    options.add_argument('--remote-debugging-address=0.0.0.0')
-    options.add_argument(f'user-agent={user_agent}')
+    partial = None
+    if http_first:
+        scraped = scrape_linkedin_company_http(url, user_agent=user_agent, timeout=timeout,
+                                               cache=cache, rate_limiter=rate_limiter)
+        if not scraped.get('error'):
+            return scraped
+        partial = scraped.get('partial')
+        logger.info(f"[HTTP] Falling back to Selenium for {url}: {scraped['error']}")
     
-    # Experimental options
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option('useAutomationExtension', False)
+    def render():
+        if rate_limiter:
+            rate_limiter.acquire(url)
+        if driver_pool is None:
+            return scrape_linkedin_company_page(url, user_agent=user_agent, timeout=timeout, cache=cache)
+        try:
+            with driver_pool.borrow() as driver:
+                scraped = scrape_linkedin_company_page(url, user_agent=user_agent, timeout=timeout, driver=driver, cache=cache)
+                if scraped.get('transient'):
+                    # Make the pool recycle this browser rather than hand it out again
+                    raise WebDriverException(scraped['error'])
+                return scraped
+        except WebDriverException as e:
+            return {'error': str(e.msg or e), 'transient': True}
+        except Exception as e:
+            return {'error': f'Failed to initialize WebDriver: {e}', 'transient': True}
+
+    scraped = SELENIUM_RETRIER.run(render, retry_result=lambda result: result.get('transient'), description=url)
     
-    # Log the Chrome binary being used
-    logging.info(f"[Selenium] Using Chrome binary at: {chrome_bin}")
-    if not os.path.exists(chrome_bin):
-        logging.warning(f"[Selenium] Chrome binary not found at: {chrome_bin}")
+    if scraped.get('error') and partial:
+        logger.info(f"Selenium failed for {url}; keeping partial HTTP result")
+        return make_company_record(url, partial, scrape_path='http-partial')
+    return scraped
 
-    try:
-        driver = None
-        
-        # Try direct Chrome first
-        try:
-            from selenium.webdriver.chrome.service import Service as ChromeService
-            from webdriver_manager.chrome import ChromeDriverManager
-            
-            logging.info("Attempting to initialize Chrome WebDriver...")
-            service = ChromeService(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=options)
-            logging.info("Successfully initialized Chrome WebDriver")
-            
-        except Exception as chrome_error:
-            logging.warning(f"Failed to initialize Chrome: {str(chrome_error)}")
-            
-            # Try Chromium as fallback
-            try:
-                from selenium.webdriver.chrome.service import Service as ChromeService
-                from webdriver_manager.chrome import ChromeDriverManager
-                from webdriver_manager.core.utils import ChromeType
-                
-                logging.info("Attempting to initialize Chromium WebDriver...")
-                service = ChromeService(ChromeDriverManager(chrome_type=ChromeType.CHROMIUM).install())
-                driver = webdriver.Chrome(service=service, options=options)
-                logging.info("Successfully initialized Chromium WebDriver")
-                
-            except Exception as chromium_error:
-                logging.error(f"Failed to initialize Chromium: {str(chromium_error)}")
-                
-                # Try direct executable path as last resort
-                try:
-                    from selenium.webdriver.chrome.service import Service as ChromeService
-                    from selenium.webdriver.chrome.options import Options
-                    
-                    logging.info("Attempting to initialize with direct Chrome path...")
-                    chrome_path = "/usr/bin/google-chrome"
-                    chromedriver_path = "/usr/local/bin/chromedriver"
-                    
-                    options.binary_location = chrome_path
-                    service = ChromeService(executable_path=chromedriver_path)
-                    driver = webdriver.Chrome(service=service, options=options)
-                    logging.info("Successfully initialized with direct Chrome path")
-                    
-                except Exception as direct_error:
-                    error_msg = f"All WebDriver initialization attempts failed. Chrome: {str(chrome_error)} | Chromium: {str(chromium_error)} | Direct: {str(direct_error)}"
-                    logging.error(error_msg)
-                    return {'error': 'Failed to initialize WebDriver. Please check logs for details.'}
-        
-        if not driver:
-            return {'error': 'Failed to initialize WebDriver after multiple attempts'}
-            
-        # Set page load timeout
-        driver.set_page_load_timeout(30)
-        
-        # Configure browser to look more like a regular user
+def scrape_linkedin_company_page(url, user_agent='Mozilla/5.0', timeout=20, driver=None, cache=None,
+                                 profile=FULL_PROFILE):
+    """
+    Scrape a LinkedIn company page using a robust, undetectable headless Selenium setup.
+    Pass a pooled ``driver`` to reuse a warm browser; otherwise a one-off browser with
+    the given ``profile`` is started and quit after the page. Rendered pages are
+    stored in ``cache``.
+    """
+    owns_driver = driver is None
+    if owns_driver:
+        logging.info(f"[Selenium] Starting headless browser for {url}")
         try:
-            # Hide WebDriver
-            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-                'source': """
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                window.navigator.chrome = { runtime: {} };
-                """
-            })
-            
-            # Set user agent and other browser properties
-            driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                'userAgent': user_agent,
-                'platform': 'Linux x86_64',
-                'acceptLanguage': 'en-US,en;q=0.9',
-                'userAgentMetadata': {
-                    'platform': 'Linux',
-                    'platformVersion': '5.4.0',
-                    'architecture': 'x86',
-                    'model': '',
-                    'mobile': False
-                }
-            })
-            
-            # Additional anti-detection measures
-            driver.execute_script("""
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['en-US', 'en', 'fr']
-                });
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [1, 2, 3, 4, 5]
-                });
-                Object.defineProperty(navigator, 'permissions', {
-                    get: () => ({
-                        query: () => Promise.resolve({ state: 'granted' })
-                    })
-                });
-            """)
-            
-        except Exception as cdp_error:
-            logging.warning(f"CDP commands failed: {str(cdp_error)}")
-            # Continue even if CDP commands fail
-            
-    except Exception as e:
-        logging.error(f"Unexpected error initializing WebDriver: {str(e)}")
-        return {'error': f'Unexpected error initializing WebDriver: {str(e)}'}
-    
+            driver = create_chrome_driver(user_agent, profile)
+        except Exception as e:
+            logging.error(f"Unexpected error initializing WebDriver: {str(e)}")
+            return {'error': 'Failed to initialize WebDriver. Please check logs for details.', 'transient': True}
+    else:
+        logging.info(f"[Selenium] Using pooled browser for {url}")
+
     driver.set_page_load_timeout(timeout)
     try:
         driver.get(url)
         logging.info("[Selenium] Page loaded")
+        # A login/auth wall never grows a company h1, so don't wait for one
+        if is_auth_wall(driver.current_url):
+            return {'error': f'LinkedIn auth wall ({driver.current_url})', 'auth_wall': True}
         # --- Optional: Automate login if needed ---
         # if 'login' in driver.current_url:
         #     logging.warning('Login required. Automating login...')
@@ -571,87 +784,152 @@ def scrape_linkedin_company_page(url, user_agent='Mozilla/5.0', timeout=20):
         #     driver.get(url)
         #     logging.info('Logged in and retried page.')
         # --- End login block ---
-        # Wait for company name
-        name = ''
+        # Wait for the company name (or a client-side redirect to the auth
+        # wall), then read every field in one script call
         try:
-            name_elem = WebDriverWait(driver, timeout).until(
-                EC.presence_of_element_located((By.TAG_NAME, 'h1'))
+            WebDriverWait(driver, timeout).until(
+                lambda d: is_auth_wall(d.current_url) or d.find_elements(By.TAG_NAME, 'h1')
             )
-            name = name_elem.text.strip()
-            logging.info(f"[Selenium] Company name: {name}")
         except Exception:
             logging.warning("[Selenium] Company name not found")
-        # Description
-        desc = ''
-        try:
-            desc_elem = driver.find_element(By.XPATH, '//meta[@name="description"]')
-            desc = desc_elem.get_attribute('content').strip() if desc_elem else ''
-            logging.info(f"[Selenium] Description: {desc[:60]}")
-        except Exception:
-            logging.warning("[Selenium] Description not found")
-        # Domain from URL
-        domain = url.split('/')[4] if len(url.split('/')) > 4 else ''
-        # Website
-        website = ''
-        try:
-            website_links = driver.find_elements(By.XPATH, '//a[contains(@href, "http") and not(contains(@href, "linkedin.com"))]')
-            for a in website_links:
-                if 'website' in a.text.lower():
-                    website = a.get_attribute('href')
-                    break
-            logging.info(f"[Selenium] Website: {website}")
-        except Exception:
-            logging.warning("[Selenium] Website not found")
-        # Company size
-        size = ''
-        try:
-            size_elem = driver.find_element(By.XPATH, '//*[contains(text(), "employees")]')
-            size = size_elem.text.strip()
-            logging.info(f"[Selenium] Size: {size}")
-        except Exception:
-            logging.warning("[Selenium] Size not found")
-        # Location
-        location = ''
-        try:
-            location_elem = driver.find_element(By.XPATH, '//*[contains(text(), "Headquarter") or contains(text(), "headquarter")]')
-            location = location_elem.text.strip()
-            logging.info(f"[Selenium] Location: {location}")
-        except Exception:
-            logging.warning("[Selenium] Location not found")
-        # Founded year
-        founded = ''
-        try:
-            founded_elem = driver.find_element(By.XPATH, '//*[contains(text(), "Founded")]')
-            founded = founded_elem.text.strip()
-            logging.info(f"[Selenium] Founded: {founded}")
-        except Exception:
-            logging.warning("[Selenium] Founded year not found")
-        # Use improved domain classification with multiple data points
-        domain_class = classify_domain(domain, name, desc)
-        # Random sleep to mimic human behavior
-        sleep_time = random.uniform(2, 4)
-        logging.info(f"[Selenium] Sleeping for {sleep_time:.2f} seconds to mimic human behavior.")
-        time.sleep(sleep_time)
+        if is_auth_wall(driver.current_url):
+            return {'error': f'LinkedIn auth wall ({driver.current_url})', 'auth_wall': True}
+        fields = extract_from_driver(driver)
+        name = fields['name']
+        missing = [field for field, value in fields.items() if not value]
+        logging.info(f"[Selenium] Extracted {name or url} (selectors v{SELECTOR_VERSION}); missing: {', '.join(missing) or 'none'}")
         # Return result
         if not name:
-            return {'error': 'Company name not found. LinkedIn may have blocked access or page structure changed.'}
-        return {
-            'companyLinkedinUrl': url,
-            'name': name,
-            'description': desc,
-            'website': website,
-            'domain': domain,
-            'domain_class': domain_class,
-            'size': size,
-            'location': location,
-            'founded': founded,
-            'scraped_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+            # An empty page is how LinkedIn's softer blocks look
+            return {'error': 'Company name not found. LinkedIn may have blocked access or page structure changed.',
+                    'auth_wall': True}
+        if cache is not None:
+            cache.put(url, driver.page_source, 200, driver.current_url)
+        return make_company_record(url, fields, scrape_path='selenium')
     except Exception as e:
         logging.error(f"[Selenium] Error scraping {url}: {e}")
-        return {'error': str(e)}
+        # Browser-level failures (crashes, page-load timeouts) are worth a retry
+        return {'error': str(e), 'transient': isinstance(e, WebDriverException)}
     finally:
-        driver.quit()
+        if owns_driver:
+            driver.quit()
+
+# Columns every scrape result has, in output order
+OUTPUT_COLUMNS = (
+    'name', 'description', 'website', 'companyLinkedinUrl', 'domain', 'domain_class',
+    'classification_confidence', 'industry_tags', 'size', 'location', 'founded', 'email', 'contact_email', 'phone', 'contact_person',
+    'scrape_path'
+)
+
+# How often a worker held by an open circuit reports that it is still alive
+PAUSE_HEARTBEAT_SECONDS = 30
+DEFAULT_MAX_PAUSE_SECONDS = 420
+
+# Fields sent with each 'company_done' progress event
+PROGRESS_FIELDS = ('name', 'website', 'domain_class', 'location', 'size', 'email', 'phone', 'scrape_path')
+
+
+def process_company(company, index, total, driver_pool, rate_limiter, user_agent='Mozilla/5.0', timeout=10,
+                    http_first=True, cache=None, emit=None, breaker=None, breaker_wait=None, criteria=None):
+    """
+    Scrape one company's LinkedIn page (HTTP first, pooled browser as fallback),
+    then extract contact details from its website. Safe to run from several
+    worker threads at once. ``emit(event_type, **data)`` receives per-company
+    progress events with stage timings.
+
+    With a ``breaker``, auth walls count as failures and the company is skipped
+    (scrape_path 'skipped') while the circuit is open, after waiting up to
+    ``breaker_wait`` seconds for it to allow a trial; a 'paused' event is
+    emitted every PAUSE_HEARTBEAT_SECONDS of that wait.
+
+    ``criteria`` (matches_criteria keyword arguments) is checked as soon as the
+    LinkedIn page is parsed; a company that fails it gets a 'rejected' reason
+    and its website is not visited.
+    """
+    emit = emit or (lambda event_type, **data: None)
+    linkedin_url = company.get('companyLinkedinUrl')
+    def paused(retry_after):
+        # Keeps the job's heartbeat fresh while the worker is held by an open circuit
+        emit('paused', index=index, url=linkedin_url, reason=breaker.last_reason, retry_after=round(retry_after, 1))
+
+    if breaker is not None and not (breaker.wait(breaker_wait, heartbeat=paused, heartbeat_seconds=PAUSE_HEARTBEAT_SECONDS)
+                                    if breaker_wait else breaker.allow()):
+        logger.warning(f"Skipping {linkedin_url}: LinkedIn circuit is open ({breaker.last_reason})")
+        emit('company_skipped', index=index, url=linkedin_url, reason=breaker.last_reason)
+        company['scrape_path'] = 'skipped'
+        return company
+    logger.info(f"Processing company {index+1}/{total}: {linkedin_url}")
+    emit('company_started', index=index, url=linkedin_url)
+    started = time.perf_counter()
+    scraped = scrape_company_page(
+        linkedin_url, user_agent=user_agent, timeout=timeout,
+        driver_pool=driver_pool, http_first=http_first, rate_limiter=rate_limiter, cache=cache
+    )
+    linkedin_seconds = round(time.perf_counter() - started, 3)
+    if breaker is not None:
+        if scraped and scraped.get('auth_wall'):
+            if breaker.record_failure(scraped.get('error', 'auth wall')):
+                emit('circuit_open', **breaker.snapshot())
+        elif scraped and not scraped.get('error'):
+            breaker.record_success()
+        else:
+            breaker.record_neutral()
+    if scraped and not scraped.get('error'):
+        company.update(scraped)
+        emit('company_scraped', index=index, url=linkedin_url, name=company.get('name', ''),
+             domain_class=company.get('domain_class', ''), scrape_path=company.get('scrape_path', ''),
+             seconds=linkedin_seconds)
+    else:
+        error = scraped.get('error') if scraped else 'Unknown error'
+        logger.warning(f"LinkedIn scraping failed: {error}")
+        emit('company_failed', index=index, url=linkedin_url, stage='linkedin', error=str(error),
+             seconds=linkedin_seconds)
+    if criteria:
+        matched, reason = matches_criteria(company, **criteria)
+        if not matched:
+            logger.info(f"Rejected {linkedin_url}: {reason}")
+            company['rejected'] = reason
+            emit('company_rejected', index=index, url=linkedin_url, name=company.get('name', ''), reason=reason)
+            return company
+    if company.get('website'):
+        started = time.perf_counter()
+        contact_info = extract_contact_info(company['website'], company.get('name', ''), cache=cache, rate_limiter=rate_limiter)
+        company.update(contact_info)
+        if contact_info.get('email') or contact_info.get('phone'):
+            emit('contact_found', index=index, url=linkedin_url, website=company['website'],
+                 email=contact_info['email'], phone=contact_info['phone'],
+                 seconds=round(time.perf_counter() - started, 3))
+    return company
+
+def load_scraper_config(config_path='scraper_config.json'):
+    """
+    Load scraper settings from the JSON config file, returning {} if it is missing or invalid
+    """
+    if not config_path or not os.path.exists(config_path):
+        return {}
+    try:
+        with open(config_path, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not load config {config_path}: {e}")
+        return {}
+
+def default_rate_limit(sleep_time):
+    """
+    Token bucket spec spacing requests to a host ``sleep_time`` seconds apart,
+    or None for no spacing
+    """
+    if not sleep_time or sleep_time <= 0:
+        return None
+    # A site visit probes several contact pages at once, so allow that as a burst
+    return {'rate': 1.0 / sleep_time, 'burst': CONTACT_PAGE_COUNT}
+
+def shared_rate_limiter(config):
+    """
+    The process-wide rate limiter, configured on first use from the
+    'rate_limits' and 'sleep_time' keys of scraper_config.json
+    """
+    return get_rate_limiter(config.get('rate_limits'), default_rate_limit(config.get('sleep_time', 1.0)))
 
 def run_scraper(
     keywords=None,
@@ -664,51 +942,279 @@ def run_scraper(
     timeout=10,
     config_path='scraper_config.json',
     output_csv='lead1.csv',
-    search_func=None
+    search_func=None,
+    workers=None,
+    http_first=None,
+    job_id=None,
+    progress_callback=None,
+    freshness_lookup=None,
+    search_backend=None,
+    lean_browser=None,
+    sinks=None,
+    max_pause_seconds=None,
+    collect=True
 ):
+    """
+    Search, scrape and filter companies, returning the matches as a DataFrame.
+
+    Matches are handed to every RecordSink in ``sinks`` (and to a CSV or JSON
+    Lines file at ``output_csv``) in search-rank order: each one goes out as
+    soon as it and every better-ranked candidate are finished, and only the
+    few finished ahead of their turn are held. File outputs are only
+    published, atomically, once the run finishes. With ``collect=False`` rows
+    are not kept once written, and the returned DataFrame is empty; its
+    attrs['result_count'] (and attrs['blocked']) still describe the run.
+
+    ``max_pause_seconds`` caps how long the 'pause' circuit breaker policy may
+    hold a company, whatever scraper_config.json says.
+    """
     logger.info(f"Starting scraper with keywords: {keywords}")
-    search_query = f"{keywords}"
-    if country and country.lower() != 'all countries':
-        search_query += f" {country}"
-    logger.info("Step 1: Scraping companies from Google...")
-    companies = []
-    if search_func is not None:
-        companies = search_func(search_query)
-    else:
-        companies = scrape_companies_google(search_query, max_results)
-    if not companies:
-        logger.warning("No companies found from Google search")
-        return pd.DataFrame()
-    logger.info(f"Found {len(companies)} companies from Google")
-    # BYPASS FILTERING: Use all found companies for Selenium scraping
-    filtered_companies = companies
-    logger.info(f"Proceeding with {len(filtered_companies)} companies (filtering bypassed)")
-    logger.info("Step 3: Extracting contact information...")
-    results = []
-    for i, company in enumerate(filtered_companies):
-        logger.info(f"Processing company {i+1}/{len(filtered_companies)}: {company.get('companyLinkedinUrl')}")
-        scraped = scrape_linkedin_company_page(company.get('companyLinkedinUrl'), user_agent=user_agent, timeout=timeout)
-        if scraped and not scraped.get('error'):
-            company.update(scraped)
+    # With a job id every finished company is checkpointed, and re-running the
+    # same job id resumes: the journaled candidate list is reused and completed
+    # companies are not scraped again
+    journal = open_journal(job_id)
+    journaled = journal.load() if journal else {'candidates': None, 'completed': {}}
+    completed = journaled['completed']
+    config = load_scraper_config(config_path)
+    # Per-host token buckets replace fixed sleeps. The shared buckets are set
+    # up once per process from scraper_config.json; a run's own sleep_time
+    # only adds stricter spacing for this run and leaves the others alone
+    rate_limiter = shared_rate_limiter(config)
+    run_default = default_rate_limit(sleep_time)
+    if run_default and run_default != rate_limiter.default:
+        rate_limiter = rate_limiter.with_default(run_default)
+    criteria = {'founded_years': founded_years, 'country': country, 'size': size}
+    # Candidates are pulled from the search lazily and scraped only until
+    # max_results of them pass the criteria, so the work done scales with the
+    # matches wanted rather than with everything the search turns up
+    batches = iter_candidate_batches(
+        keywords, founded_years, country, size, max_results, config=config, search_func=search_func,
+        search_backend=search_backend, max_rounds=max(1, int(config.get('max_search_rounds', 3)))
+    )
+    if journaled['candidates'] is not None:
+        logger.info(f"Resuming job {job_id}: {len(completed)}/{len(journaled['candidates'])} companies already done")
+        batches = itertools.chain([journaled['candidates']], batches)
+    candidates = []
+    seen_urls = set()
+    # Finished companies waiting for a better-ranked one; None marks a skipped company
+    finished = {}
+    pending = deque()
+    freshness_days = config.get('freshness_days', 0)
+    progress_lock = threading.Lock()
+    progress = {'completed': 0, 'rejected': 0, 'skipped': 0}
+
+    def emit(event_type, **data):
+        # progress_callback may be called from worker threads and must not raise
+        if progress_callback is None:
+            return
+        try:
+            progress_callback({'type': event_type, 'job_id': job_id, **data})
+        except Exception as e:
+            logger.warning(f"Progress callback failed: {e}")
+
+    sink = MultiSink(list(sinks or []) + ([open_file_sink(output_csv, OUTPUT_COLUMNS)] if output_csv else []))
+    matches = []
+    delivered = {'count': 0, 'next': 0}
+
+    def write(company):
+        if company is None or company.get('rejected') or delivered['count'] >= max_results:
+            return
+        row = {**{column: '' for column in OUTPUT_COLUMNS}, **company}
+        sink.write(row)
+        if collect:
+            matches.append(row)
+        delivered['count'] += 1
+
+    def deliver(index, company):
+        # Called from the run_scraper thread only, so sinks need not be thread-safe
+        finished[index] = company
+        while delivered['next'] in finished:
+            write(finished.pop(delivered['next']))
+            delivered['next'] += 1
+
+    def resolve(company):
+        if company.get('rejected'):
+            progress['rejected'] += 1
         else:
-            logger.warning(f"Selenium scraping failed: {scraped.get('error') if scraped else 'Unknown error'}")
-        if company.get('website'):
-            contact_info = extract_contact_info(company['website'], company.get('name', ''))
-            company.update(contact_info)
-        time.sleep(sleep_time)
-        results.append(company)
-    df = pd.DataFrame(results)
-    required_columns = [
-        'name', 'description', 'website', 'companyLinkedinUrl', 'domain', 'domain_class',
-        'size', 'location', 'founded', 'email', 'contact_email', 'phone', 'contact_person'
-    ]
-    for col in required_columns:
+            progress['completed'] += 1
+
+    def pull_candidates():
+        """
+        Add the next search round with new companies to the queue; False once
+        the search rounds run out. A round that only repeats known companies
+        (as round 1 does after the journaled candidates of a resumed job) moves
+        on to the next, wider one.
+        """
+        new = []
+        while not new:
+            search_started = time.perf_counter()
+            batch = next(batches, None)
+            if batch is None:
+                return False
+            emit('stage', stage='search', seconds=round(time.perf_counter() - search_started, 3))
+            for company in batch:
+                url = company.get('companyLinkedinUrl')
+                if url and url not in seen_urls:
+                    seen_urls.add(url)
+                    new.append(company)
+        first = len(candidates)
+        candidates.extend(new)
+        logger.info(f"Found {len(new)} new candidate companies ({len(candidates)} in total)")
+        if journal and first >= len(journaled['candidates'] or []):
+            journal.record_candidates(candidates)
+        unresolved = []
+        for index in range(first, len(candidates)):
+            done = completed.get(candidates[index].get('companyLinkedinUrl'))
+            if done is not None:
+                resolve(done)
+                deliver(index, done)
+            else:
+                unresolved.append(index)
+        # Companies stored within the freshness window are reused instead of scraped
+        if freshness_lookup is not None and freshness_days and unresolved:
+            fresh = freshness_lookup([candidates[i].get('companyLinkedinUrl') for i in unresolved], freshness_days)
+            to_scrape = []
+            for index in unresolved:
+                record = fresh.get(candidates[index].get('companyLinkedinUrl'))
+                if record is None:
+                    to_scrape.append(index)
+                    continue
+                company = {**candidates[index], **record, 'scrape_path': 'db'}
+                matched, reason = matches_criteria(company, **criteria)
+                if not matched:
+                    company['rejected'] = reason
+                resolve(company)
+                deliver(index, company)
+            if fresh:
+                logger.info(f"Reusing {len(fresh)} companies scraped within the last {freshness_days} days")
+            unresolved = to_scrape
+        pending.extend(unresolved)
+        return True
+
+    try:
+        if not pull_candidates():
+            logger.warning("No companies found by the search")
+            sink.close()
+            df = pd.DataFrame()
+            df.attrs['result_count'] = 0
+            return df
+        logger.info("Step 3: Scraping companies and extracting contact information...")
+        if workers is None:
+            workers = config.get('workers', 1)
+        workers = max(1, min(int(workers), max_results))
+        if lean_browser is None:
+            lean_browser = config.get('lean_browser', False)
+        driver_pool = get_driver_pool(
+            user_agent=user_agent,
+            size=max(workers, config.get('driver_pool_size') or 0) or None,
+            max_pages=config.get('driver_max_pages'),
+            profile=get_browser_profile(lean_browser)
+        )
+        if http_first is None:
+            http_first = config.get('http_first', True)
+        if not http_first and pending and progress['completed'] < max_results:
+            # Browsers are only needed up front when there is no HTTP fast path
+            driver_pool.warm_up(workers)
+        page_cache = get_page_cache(config.get('page_cache'))
+        # Consecutive auth walls open the breaker; then the rest of the queue is
+        # either skipped at once ('fail_fast') or held until a trial page gets
+        # through ('pause', for at most max_pause_seconds per company)
+        breaker_config = config.get('circuit_breaker') or {}
+        breaker = None
+        breaker_wait = None
+        if breaker_config.get('enabled', True):
+            breaker = CircuitBreaker(
+                'linkedin',
+                failure_threshold=breaker_config.get('failure_threshold', 3),
+                cooldown_seconds=breaker_config.get('cooldown_seconds', 300)
+            )
+            if breaker_config.get('policy', 'fail_fast') == 'pause':
+                breaker_wait = breaker_config.get('max_pause_seconds', DEFAULT_MAX_PAUSE_SECONDS)
+                if max_pause_seconds is not None:
+                    breaker_wait = min(breaker_wait, max_pause_seconds)
+
+        emit('started', total=max_results, completed=min(progress['completed'], max_results))
+        scrape_started = time.perf_counter()
+
+        def process(index):
+            started = time.perf_counter()
+            try:
+                company = process_company(
+                    dict(candidates[index]), index, len(candidates), driver_pool, rate_limiter,
+                    user_agent=user_agent, timeout=timeout, http_first=http_first, cache=page_cache, emit=emit,
+                    breaker=breaker, breaker_wait=breaker_wait, criteria=criteria
+                )
+            except Exception as e:
+                emit('company_failed', index=index, url=candidates[index].get('companyLinkedinUrl'),
+                     stage='process', error=str(e))
+                raise
+            if company.get('scrape_path') == 'skipped':
+                # Not journaled, so resuming the job scrapes it
+                with progress_lock:
+                    progress['skipped'] += 1
+                return None
+            if journal:
+                # Rejected companies are journaled too so a resumed job does not scrape them again
+                journal.record_company(company.get('companyLinkedinUrl'), company)
+            with progress_lock:
+                resolve(company)
+                completed_count = progress['completed']
+            if company.get('rejected'):
+                return company
+            # The row itself goes out with the event so clients can show partial results
+            emit('company_done', index=index, url=company.get('companyLinkedinUrl'),
+                 name=company.get('name', ''), completed=completed_count, total=max_results,
+                 seconds=round(time.perf_counter() - started, 3),
+                 company={key: company.get(key, '') for key in PROGRESS_FIELDS})
+            return company
+
+        logger.info(f"Collecting up to {max_results} matching companies with {workers} concurrent workers")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = {}
+            while True:
+                # Never start more scrapes than could still be needed to reach max_results
+                while pending and len(in_flight) < workers and progress['completed'] + len(in_flight) < max_results:
+                    index = pending.popleft()
+                    in_flight[executor.submit(process, index)] = index
+                if in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = in_flight.pop(future)
+                        deliver(index, future.result())
+                    continue
+                # An open circuit would only skip whatever a new search round finds
+                if progress['completed'] >= max_results or progress['skipped'] or not pull_candidates():
+                    break
+        logger.info(f"Went through {len(candidates) - len(pending)} of {len(candidates)} candidates: "
+                    f"{progress['completed']} matched, {progress['rejected']} rejected by the criteria")
+        # Candidates never scraped (the run stopped at max_results or on an
+        # open circuit) leave gaps; whatever finished after them goes out now
+        for index in sorted(finished):
+            write(finished.pop(index))
+    except BaseException:
+        # A crashed run must not publish (or leave behind) half-written output
+        sink.abort()
+        raise
+    # Rows keep the search ranking; rejected and skipped companies are left out
+    df = pd.DataFrame(matches)
+    for col in OUTPUT_COLUMNS:
         if col not in df.columns:
             df[col] = ''
+    df.attrs['result_count'] = delivered['count']
+    emit('stage', stage='scrape', seconds=round(time.perf_counter() - scrape_started, 3))
+    if page_cache is not None:
+        logger.info(f"Page cache stats: {page_cache.stats()}")
+    if progress['skipped']:
+        # Callers check df.attrs['blocked'] to report the run as blocked
+        df.attrs['blocked'] = (
+            f"LinkedIn is blocking the scraper ({breaker.last_reason}); {progress['skipped']} of {len(candidates)} "
+            f"companies were not scraped" + (f". Re-run job {job_id} later to resume them." if job_id else '.')
+        )
+        logger.error(df.attrs['blocked'])
+    sink.close()
     if output_csv:
-        df.to_csv(output_csv, index=False)
         logger.info(f"Results saved to {output_csv}")
-    logger.info(f"Scraping completed successfully. Found {len(df)} companies.")
+    logger.info(f"Scraping completed successfully. Found {delivered['count']} companies.")
     return df
 
 if __name__ == '__main__':
@@ -722,10 +1228,21 @@ if __name__ == '__main__':
     parser.add_argument('--max_results', type=int, default=10, help='Max LinkedIn results')
     parser.add_argument('--user_agent', type=str, default='Mozilla/5.0', help='User agent')
     parser.add_argument('--timeout', type=int, default=10, help='Request timeout')
-    parser.add_argument('--output_csv', type=str, default='lead1.csv', help='Output CSV file')
-    parser.add_argument('--sleep_time', type=float, default=1.0, help='Sleep time between requests (seconds)')
+    parser.add_argument('--output_csv', type=str, default='lead1.csv', help='Output file, written as companies complete (.csv, or .jsonl for JSON Lines)')
+    parser.add_argument('--sleep_time', type=float, default=1.0, help='Minimum delay between requests to the same host (seconds)')
+    parser.add_argument('--no_http_first', action='store_true', help='Always render LinkedIn pages with Selenium')
+    parser.add_argument('--job_id', type=str, default=None, help='Checkpoint under this job id; re-run with the same id to resume')
+    parser.add_argument('--workers', type=int, default=None, help='Companies scraped concurrently (default: config or 1)')
+    parser.add_argument('--lean_browser', action='store_true', help='Block images, fonts, media and trackers and stop loading at DOMContentLoaded')
+    parser.add_argument('--search_backend', type=str, default=None, choices=SEARCH_BACKENDS, help='Where candidate companies come from (default: config or google)')
+    parser.add_argument('--search_fixture', type=str, default=None, help='Fixture file for the file search backend (JSON, CSV or one URL per line)')
     args = parser.parse_args()
     founded_years = args.founded_years.split(',') if args.founded_years else None
+    search_backend = FileSearchBackend(args.search_fixture) if args.search_fixture else args.search_backend
+    if (search_backend or load_scraper_config(args.config_path).get('search_backend')) == 'db':
+        # Outside a web request there is no app context, so hand the backend the Flask app
+        from app import app
+        search_backend = DatabaseSearchBackend(app=app)
     print(f"Running scraper with keywords={args.keywords}, country={args.country}, max_results={args.max_results}")
     df = run_scraper(
         keywords=args.keywords,
@@ -735,8 +1252,20 @@ if __name__ == '__main__':
         max_results=args.max_results,
         user_agent=args.user_agent,
         timeout=args.timeout,
-        sleep_time=args.sleep_time
+        sleep_time=args.sleep_time,
+        config_path=args.config_path,
+        output_csv=args.output_csv,
+        workers=args.workers,
+        job_id=args.job_id,
+        http_first=False if args.no_http_first else None,
+        lean_browser=True if args.lean_browser else None,
+        search_backend=search_backend,
+        collect=False
     )
-    print(f"Scraped {len(df)} companies and saved to {args.output_csv}")
-    print(df if not df.empty else 'No data scraped or an error occurred.')
+    if df.attrs.get('blocked'):
+        print(f"WARNING: {df.attrs['blocked']}")
+    if df.attrs['result_count']:
+        print(f"Scraped {df.attrs['result_count']} companies and saved them to {args.output_csv}")
+    else:
+        print('No data scraped or an error occurred.')
     print('--- Script finished ---')
\ No newline at end of file
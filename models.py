@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from db import db
 
@@ -25,7 +26,7 @@ class Company(db.Model):
     business_activities = db.Column(db.Text)  # Extracted business activities
     company_maturity = db.Column(db.String(20))  # startup, growth, established
     classification_confidence = db.Column(db.Integer)  # Classification confidence score
-    industry_tags = db.Column(db.Text)  # Multiple industry tags
+    industry_tags = db.Column(db.Text)  # JSON object of the best-scoring industries -> score
     
     # Email and contact fields
     email = db.Column(db.String(255))
@@ -103,6 +104,14 @@ class Company(db.Model):
             scraped_at=datetime.now()
         )
 
+    def get_industry_tags(self):
+        """Best-scoring industries as {industry: score}, best first"""
+        try:
+            tags = json.loads(self.industry_tags) if self.industry_tags else {}
+        except ValueError:
+            return {}
+        return tags if isinstance(tags, dict) else {}
+
     def get_primary_email(self):
         """Get the primary email address for this company"""
         return self.contact_email or self.email or ''
@@ -161,4 +170,62 @@ class Company(db.Model):
         
         for field in updatable_fields:
             if field in data and hasattr(self, field):
-                setattr(self, field, data[field])
\ No newline at end of file
+                setattr(self, field, data[field])
+
+class ScrapeJob(db.Model):
+    """Queued scrape request, executed by the background worker (worker.py)"""
+    __tablename__ = 'scrape_jobs'
+    
+    id = db.Column(db.String(32), primary_key=True)
+    status = db.Column(db.String(20), default='queued', index=True)  # queued, running, completed, failed
+    params = db.Column(db.Text)  # JSON-encoded run_scraper arguments
+    progress = db.Column(db.Integer, default=0)  # companies finished so far
+    total = db.Column(db.Integer, default=0)  # companies in this job
+    result_count = db.Column(db.Integer, default=0)  # rows are in the job's output file
+    error = db.Column(db.Text)
+    worker_id = db.Column(db.String(100))
+    attempts = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<ScrapeJob {self.id} {self.status}>'
+    
+    def get_params(self):
+        return json.loads(self.params) if self.params else {}
+    
+    def to_dict(self):
+        """Convert job to a status dictionary for the API"""
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'params': self.get_params(),
+            'progress': self.progress or 0,
+            'total': self.total or 0,
+            'result_count': self.result_count or 0,
+            'error': self.error,
+            'attempts': self.attempts or 0,
+            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else None,
+            'started_at': self.started_at.strftime('%Y-%m-%d %H:%M:%S') if self.started_at else None,
+            'finished_at': self.finished_at.strftime('%Y-%m-%d %H:%M:%S') if self.finished_at else None
+        }
+        return data
+
+
+class ScrapeJobEvent(db.Model):
+    """Progress event recorded while a scrape job runs, streamed to clients over SSE"""
+    __tablename__ = 'scrape_job_events'
+    
+    id = db.Column(db.Integer, primary_key=True)  # doubles as the SSE event id
+    job_id = db.Column(db.String(32), db.ForeignKey('scrape_jobs.id'), index=True, nullable=False)
+    event_type = db.Column(db.String(40), nullable=False)
+    payload = db.Column(db.Text)  # JSON-encoded event data
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    
+    def __repr__(self):
+        return f'<ScrapeJobEvent {self.job_id} {self.id} {self.event_type}>'
+    
+    def get_payload(self):
+        return json.loads(self.payload) if self.payload else {}
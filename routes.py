@@ -1,14 +1,17 @@
+import hmac
 import json
 import os
+import time
 import logging
 import traceback
-from flask import render_template, request, jsonify, send_file, redirect, url_for, flash, session
+from flask import render_template, request, jsonify, send_file, redirect, url_for, flash, session, Response, stream_with_context
 import pandas as pd
-from leads import run_scraper
-from utils.nlp_processor import process_descriptions
+from jobs import RESULTS_PAGE_SIZE, enqueue_scrape_job, read_job_results, reclassify_companies
 from utils.groq_email_generator import GroqEmailGenerator
 from utils.cpanel_email_sender import CPanelEmailSender
-from models import Company
+from utils.record_sink import job_output_path
+from utils.taxonomy import get_taxonomy_matcher, reload_taxonomy
+from models import Company, ScrapeJob, ScrapeJobEvent
 from db import db
 from datetime import datetime
 
@@ -16,6 +19,58 @@ from datetime import datetime
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Server-Sent Events: how often the event table is polled, how often an idle
+# stream sends a keep-alive comment, and how long one response may stay open.
+# A stream holds a gunicorn worker thread, and gunicorn kills workers that are
+# busy past its timeout (30 s by default), so each response ends well before
+# that; EventSource reconnects on its own and resumes from Last-Event-ID
+SSE_POLL_SECONDS = float(os.environ.get('SSE_POLL_SECONDS', 1.0))
+SSE_KEEPALIVE_SECONDS = 15
+SSE_MAX_STREAM_SECONDS = int(os.environ.get('SSE_MAX_STREAM_SECONDS', 20))
+FINISHED_JOB_STATUSES = ('completed', 'failed')
+
+def format_sse(event):
+    """Serialize a ScrapeJobEvent as one Server-Sent Events message"""
+    return f"id: {event.id}\nevent: {event.event_type}\ndata: {json.dumps(event.get_payload())}\n\n"
+
+# Written by command-line runs of leads.py; served when no job output exists
+LEGACY_OUTPUT_CSV = 'lead1.csv'
+
+def find_output_csv(job_id=None):
+    """
+    Path of a job's published CSV, or of the most recently finished job's CSV
+    (falling back to lead1.csv) when no job is given; None if there is none.
+    Raises ValueError for a malformed job id.
+    """
+    if job_id:
+        path = job_output_path(job_id)
+        return path if os.path.exists(path) else None
+    finished = (ScrapeJob.query
+                .filter(ScrapeJob.status.in_(FINISHED_JOB_STATUSES), ScrapeJob.finished_at.isnot(None))
+                .order_by(ScrapeJob.finished_at.desc())
+                .limit(20))
+    for job in finished:
+        path = job_output_path(job.id)
+        if os.path.exists(path):
+            return path
+    return LEGACY_OUTPUT_CSV if os.path.exists(LEGACY_OUTPUT_CSV) else None
+
+def admin_token_error():
+    """
+    None if the request carries the ADMIN_TOKEN (X-Admin-Token header or a
+    Bearer token), otherwise the error response to return
+    """
+    expected = os.environ.get('ADMIN_TOKEN')
+    if not expected:
+        return jsonify({'error': 'Admin endpoints are disabled; set ADMIN_TOKEN to enable them'}), 403
+    supplied = request.headers.get('X-Admin-Token', '')
+    authorization = request.headers.get('Authorization', '')
+    if not supplied and authorization.startswith('Bearer '):
+        supplied = authorization[len('Bearer '):]
+    if not hmac.compare_digest(supplied.encode(), expected.encode()):
+        return jsonify({'error': 'Invalid admin token'}), 401
+    return None
+
 def register_routes(app, db):
     """Register all application routes"""
     
@@ -31,13 +86,13 @@ def register_routes(app, db):
                 logger.warning(f"Could not load config: {e}")
         
         # Check if CSV exists to pass to template
-        csv_exists = os.path.exists('lead1.csv')
+        csv_exists = find_output_csv() is not None
         
         return render_template('index.html', config=config, csv_exists=csv_exists)
 
     @app.route('/scrape', methods=['POST'])
     def scrape():
-        """Handle company scraping requests and return JSON."""
+        """Queue a company scraping job and return its id as JSON."""
         try:
             keywords = request.form.get('keywords', 'IT services')
             founded_years_str = request.form.get('founded_years', '')
@@ -47,67 +102,119 @@ def register_routes(app, db):
             max_results = int(request.form.get('max_results', 10))
             sleep_time = float(request.form.get('sleep_time', 1.0))
             
-            results_df = run_scraper(
-                keywords=keywords,
-                founded_years=founded_years,
-                country=country,
-                size=size,
-                max_results=max_results,
-                sleep_time=sleep_time
-            )
+            job = enqueue_scrape_job({
+                'keywords': keywords,
+                'founded_years': founded_years,
+                'country': country,
+                'size': size,
+                'max_results': max_results,
+                'sleep_time': sleep_time,
+                'search_backend': request.form.get('search_backend') or None,
+                'lean_browser': request.form.get('lean_browser') == 'on'
+            })
             
-            if not results_df.empty:
-                results_df = process_descriptions(results_df)
-                
-                companies_saved = 0
-                for _, row in results_df.iterrows():
-                    try:
-                        company_data = row.to_dict()
-                        existing_company = Company.query.filter_by(linkedin_url=company_data.get('companyLinkedinUrl')).first()
-                        if existing_company:
-                            for key, value in company_data.items():
-                                if hasattr(existing_company, key):
-                                    setattr(existing_company, key, value)
-                        else:
-                            new_company = Company.from_dict(company_data)
-                            db.session.add(new_company)
-                        db.session.commit()
-                        companies_saved += 1
-                    except Exception as e:
-                        logger.error(f"Error saving company to database: {e}")
-                        db.session.rollback()
-                
-                # Store results in session to display on another page
-                session['scraping_results'] = results_df.to_dict('records')
-                
-                return jsonify({
-                    'success': True,
-                    'message': f'Successfully scraped {companies_saved} companies.',
-                    'redirect_url': url_for('show_results')
-                })
-            else:
-                return jsonify({'success': False, 'error': 'No results found.'}), 404
+            return jsonify({
+                'success': True,
+                'job_id': job.id,
+                'message': 'Scraping job queued.',
+                'status_url': url_for('job_status', job_id=job.id),
+                'events_url': url_for('job_events', job_id=job.id),
+                'redirect_url': url_for('show_results', job_id=job.id)
+            }), 202
                 
         except Exception as e:
-            logger.error(f"Error during scraping: {e}")
+            logger.error(f"Error queuing scrape job: {e}")
             logger.error(traceback.format_exc())
             return jsonify({'success': False, 'error': str(e)}), 500
 
+    @app.route('/api/jobs/<job_id>', methods=['GET'])
+    def job_status(job_id):
+        """
+        Report a scrape job's status, progress and (once completed) a page of its
+        results in search-rank order: ?offset=N&limit=M, 100 rows by default.
+        """
+        job = db.session.get(ScrapeJob, job_id)
+        if job is None:
+            return jsonify({'error': f'Job {job_id} not found'}), 404
+        data = job.to_dict()
+        if job.status == 'completed':
+            offset = max(0, request.args.get('offset', 0, type=int))
+            limit = max(1, request.args.get('limit', RESULTS_PAGE_SIZE, type=int))
+            data['offset'] = offset
+            data['results'] = read_job_results(job.id, offset, limit)
+        if job.status in FINISHED_JOB_STATUSES:
+            data['download_url'] = url_for('download', job_id=job.id)
+        return jsonify(data)
+
+    @app.route('/api/jobs/<job_id>/events', methods=['GET'])
+    def job_events(job_id):
+        """Stream a scrape job's progress events as Server-Sent Events."""
+        if db.session.get(ScrapeJob, job_id) is None:
+            return jsonify({'error': f'Job {job_id} not found'}), 404
+        try:
+            last_id = int(request.headers.get('Last-Event-ID') or request.args.get('last_event_id') or 0)
+        except ValueError:
+            last_id = 0
+
+        def stream():
+            cursor = last_id
+            opened = last_sent = time.monotonic()
+            yield f"retry: {int(SSE_POLL_SECONDS * 2000)}\n\n"
+            while time.monotonic() - opened < SSE_MAX_STREAM_SECONDS:
+                # End the read transaction so each poll sees rows the worker committed
+                db.session.rollback()
+                status = db.session.query(ScrapeJob.status).filter_by(id=job_id).scalar()
+                events = (ScrapeJobEvent.query
+                          .filter(ScrapeJobEvent.job_id == job_id, ScrapeJobEvent.id > cursor)
+                          .order_by(ScrapeJobEvent.id)
+                          .limit(200)
+                          .all())
+                for event in events:
+                    cursor = event.id
+                    yield format_sse(event)
+                if events:
+                    last_sent = time.monotonic()
+                    continue
+                if status in FINISHED_JOB_STATUSES:
+                    yield "event: end\ndata: {}\n\n"
+                    return
+                if time.monotonic() - last_sent >= SSE_KEEPALIVE_SECONDS:
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+                time.sleep(SSE_POLL_SECONDS)
+
+        return Response(stream_with_context(stream()), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+
     @app.route('/results')
     def show_results():
-        """Display scraping results stored in the session."""
-        results = session.pop('scraping_results', [])
+        """Display the results of a finished scrape job (its first page) or legacy session results."""
+        job_id = request.args.get('job_id')
+        total = None
+        if job_id:
+            job = db.session.get(ScrapeJob, job_id)
+            completed = job is not None and job.status == 'completed'
+            results = read_job_results(job.id) if completed else []
+            total = job.result_count if completed else None
+        else:
+            results = session.pop('scraping_results', [])
         if not results:
             flash("No scraping results to display.", "warning")
             return redirect(url_for('index'))
-        return render_template('results.html', results=results)
+        return render_template('results.html', results=results, job_id=job_id, total=total)
 
     @app.route('/download')
     def download():
         try:
-            # Create a CSV string from the DataFrame
-            if os.path.exists('lead1.csv'):
-                return send_file('lead1.csv', as_attachment=True, download_name='linkedin_companies.csv')
+            # ?job_id=... serves that job's output; otherwise the latest finished job's
+            job_id = request.args.get('job_id')
+            path = find_output_csv(job_id)
+            if path:
+                download_name = f'linkedin_companies_{job_id}.csv' if job_id else 'linkedin_companies.csv'
+                return send_file(os.path.abspath(path), as_attachment=True, download_name=download_name,
+                                 mimetype='text/csv')
             else:
                 flash("No data available to download. Please run a scrape first.", "warning")
                 return redirect(url_for('index'))
@@ -134,57 +241,24 @@ def register_routes(app, db):
     def api_scrape():
         try:
             body = request.get_json()
-            keywords = body.get('keywords', 'IT services')
-            founded_years = body.get('founded_years', ['2015'])
-            country = body.get('country', 'United Kingdom')
-            size = body.get('size', '51-200')
-            max_results = body.get('max_results', 10)
-            
-            # Run the scraper
-            df = run_scraper(
-                keywords=keywords, 
-                founded_years=founded_years, 
-                country=country, 
-                size=size,
-                max_results=max_results
-            )
-            
-            # Process with NLP
-            df = process_descriptions(df)
-            
-            # Save to CSV
-            df.to_csv('lead1.csv', index=False)
-            
-            # Save to database
-            for _, row in df.iterrows():
-                try:
-                    company_data = row.to_dict()
-                    existing_company = Company.query.filter_by(linkedin_url=company_data.get('companyLinkedinUrl')).first()
-                    
-                    if existing_company:
-                        # Update existing company
-                        for key, value in company_data.items():
-                            if key == 'companyLinkedinUrl':
-                                continue
-                            if hasattr(existing_company, key):
-                                setattr(existing_company, key, value)
-                        db.session.commit()
-                    else:
-                        # Create new company record
-                        new_company = Company.from_dict(company_data)
-                        db.session.add(new_company)
-                        db.session.commit()
-                except Exception as e:
-                    logger.error(f"Error saving company to database: {str(e)}")
-                    db.session.rollback()
+            job = enqueue_scrape_job({
+                'keywords': body.get('keywords', 'IT services'),
+                'founded_years': body.get('founded_years', ['2015']),
+                'country': body.get('country', 'United Kingdom'),
+                'size': body.get('size', '51-200'),
+                'max_results': body.get('max_results', 10),
+                'search_backend': body.get('search_backend'),
+                'lean_browser': body.get('lean_browser')
+            })
             
-            # Return as CSV string
-            csv_str = df.to_csv(index=False)
+            # The scrape runs in the background worker; poll status_url for results
+            # or subscribe to events_url for live progress
             return {
-                "statusCode": 200,
-                "headers": {"Content-Type": "text/csv"},
-                "body": csv_str
-            }
+                "statusCode": 202,
+                "job_id": job.id,
+                "status_url": url_for('job_status', job_id=job.id),
+                "events_url": url_for('job_events', job_id=job.id)
+            }, 202
         except Exception as e:
             logger.error(f"API error: {str(e)}")
             logger.error(traceback.format_exc())
@@ -195,8 +269,23 @@ def register_routes(app, db):
 
     @app.route('/api/companies', methods=['GET'])
     def api_companies():
+        """
+        Stored companies. ?min_confidence=N keeps classifications at least N
+        confident; each ?tag=Industry keeps companies classified as, or with a
+        top industry tag of, that industry (case-insensitive).
+        """
         try:
-            companies = Company.query.all()
+            query = Company.query
+            min_confidence = request.args.get('min_confidence', type=int)
+            if min_confidence is not None:
+                query = query.filter(Company.classification_confidence >= min_confidence)
+            for tag in request.args.getlist('tag'):
+                # industry_tags is a JSON object, so a tag appears as '"<tag>":'
+                query = query.filter(db.or_(
+                    db.func.lower(Company.domain_class) == tag.lower(),
+                    Company.industry_tags.icontains(json.dumps(tag) + ':', autoescape=True)
+                ))
+            companies = query.all()
             company_list = [company.to_dict() for company in companies]
             return jsonify({
                 "statusCode": 200,
@@ -388,6 +477,43 @@ def register_routes(app, db):
             flash(f"Error loading dashboard: {str(e)}", "danger")
             return redirect(url_for('index'))
 
+    @app.route('/api/admin/taxonomy', methods=['GET'])
+    def taxonomy_status():
+        """Report which taxonomy version this process classifies with."""
+        error = admin_token_error()
+        if error:
+            return error
+        return jsonify(get_taxonomy_matcher().describe())
+
+    @app.route('/api/admin/taxonomy/reload', methods=['POST'])
+    def taxonomy_reload():
+        """
+        Recompile the taxonomy file now. Only this process reloads immediately;
+        the others pick the change up from the file's mtime within seconds.
+        """
+        error = admin_token_error()
+        if error:
+            return error
+        try:
+            matcher = reload_taxonomy()
+        except ValueError as e:
+            logger.error(f"Taxonomy reload failed: {e}")
+            return jsonify({'success': False, 'error': str(e), 'current': get_taxonomy_matcher().describe()}), 400
+        return jsonify({'success': True, **matcher.describe()})
+
+    @app.route('/api/admin/reclassify', methods=['POST'])
+    def reclassify():
+        """Reclassify every stored company with the current taxonomy."""
+        error = admin_token_error()
+        if error:
+            return error
+        try:
+            return jsonify({'success': True, **reclassify_companies()})
+        except Exception as e:
+            logger.error(f"Reclassification failed: {e}")
+            db.session.rollback()
+            return jsonify({'success': False, 'error': str(e)}), 500
+
     @app.route('/get-email/<int:company_id>', methods=['GET'])
     def get_email(company_id):
         """[DEBUG] Fetch the generated email content for a specific company."""
@@ -223,7 +223,7 @@ function downloadData(data, filename, type = 'text/csv') {
 // Progress tracking for scraping operations
 function updateProgress(current, total, message = '') {
     const progressBar = document.querySelector('.progress-bar');
-    if (progressBar) {
+    if (progressBar && total > 0) {
         const percentage = Math.round((current / total) * 100);
         progressBar.style.width = `${percentage}%`;
         progressBar.setAttribute('aria-valuenow', percentage);
@@ -236,58 +236,97 @@ function updateProgress(current, total, message = '') {
     }
 }
 
-// WebSocket connection for real-time updates (if needed)
-function initializeWebSocket() {
-    if (typeof WebSocket === 'undefined') {
-        console.log('WebSocket not supported');
-        return;
+// Event types sent by /api/jobs/<job_id>/events
+const SCRAPE_EVENT_TYPES = [
+    'stage', 'started', 'company_started', 'company_scraped', 'contact_found',
+    'company_failed', 'company_rejected', 'company_skipped', 'circuit_open', 'paused', 'company_done', 'job_completed', 'job_failed'
+];
+
+// Server-Sent Events stream of a scrape job's progress
+function initializeEventStream(eventsUrl, handlers = {}) {
+    if (typeof EventSource === 'undefined') {
+        console.log('EventSource not supported');
+        return null;
     }
     
-    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-    const wsUrl = `${protocol}//${window.location.host}/ws`;
+    const source = new EventSource(eventsUrl);
     
-    try {
-        const ws = new WebSocket(wsUrl);
-        
-        ws.onopen = function() {
-            console.log('WebSocket connected');
-        };
-        
-        ws.onmessage = function(event) {
-            const data = JSON.parse(event.data);
-            handleWebSocketMessage(data);
-        };
-        
-        ws.onclose = function() {
-            console.log('WebSocket disconnected');
-            // Attempt to reconnect after 5 seconds
-            setTimeout(initializeWebSocket, 5000);
-        };
-        
-        ws.onerror = function(error) {
-            console.error('WebSocket error:', error);
-        };
-        
-        return ws;
-    } catch (error) {
-        console.error('Failed to create WebSocket connection:', error);
-    }
+    SCRAPE_EVENT_TYPES.forEach(function(type) {
+        source.addEventListener(type, function(event) {
+            handleScrapeEvent(type, JSON.parse(event.data), handlers);
+        });
+    });
+    
+    // Sent once the job has finished and every event was delivered
+    source.addEventListener('end', function() {
+        source.close();
+        if (handlers.end) {
+            handlers.end();
+        }
+    });
+    
+    // EventSource reconnects by itself (resuming from the last event id);
+    // a CLOSED state means the server refused the stream
+    source.onerror = function(error) {
+        if (source.readyState === EventSource.CLOSED) {
+            console.error('Progress stream closed:', error);
+            if (handlers.error) {
+                handlers.error(error);
+            }
+        }
+    };
+    
+    return source;
 }
 
-function handleWebSocketMessage(data) {
-    switch (data.type) {
-        case 'scraping_progress':
-            updateProgress(data.current, data.total, data.message);
+function handleScrapeEvent(type, data, handlers = {}) {
+    switch (type) {
+        case 'stage':
+            console.log(`Scrape stage "${data.stage}" took ${data.seconds}s`);
+            break;
+        case 'started':
+            updateProgress(data.completed, data.total, `Scraping ${data.total} companies...`);
+            break;
+        case 'company_started':
+            updateProgress(0, 0, `Scraping ${data.url}`);
+            break;
+        case 'company_scraped':
+            updateProgress(0, 0, `Scraped ${data.name || data.url} via ${data.scrape_path} (${data.seconds}s)`);
+            break;
+        case 'contact_found':
+            updateProgress(0, 0, `Found ${data.email || data.phone} on ${data.website}`);
+            break;
+        case 'company_failed':
+            console.warn(`Scraping ${data.url} failed at ${data.stage}: ${data.error}`);
             break;
-        case 'scraping_complete':
-            showAlert('success', 'Scraping Complete', `Found ${data.count} companies`);
-            location.reload();
+        case 'company_rejected':
+            updateProgress(0, 0, `Skipped ${data.name || data.url}: ${data.reason}`);
             break;
-        case 'error':
-            showAlert('danger', 'Error', data.message);
+        case 'company_skipped':
+            console.warn(`Skipped ${data.url}: ${data.reason}`);
+            break;
+        case 'circuit_open':
+            updateProgress(0, 0, `LinkedIn is blocking requests (${data.reason}); stopping or pausing the remaining companies`);
+            break;
+        case 'paused':
+            updateProgress(0, 0, `Paused: LinkedIn is blocking requests (${data.reason}); next try in ${Math.ceil(data.retry_after)}s`);
+            break;
+        case 'company_done':
+            updateProgress(data.completed, data.total, `Finished ${data.name || data.url} (${data.completed}/${data.total})`);
+            break;
+        case 'job_completed':
+            updateProgress(1, 1, `Scraping complete: ${data.result_count} companies`);
+            break;
+        case 'job_failed':
+            // Reported to the user once, by whoever waits for the job (see waitForJob in index.html)
+            updateProgress(0, 0, `Scraping failed: ${data.error || 'Unknown error'}`);
             break;
         default:
-            console.log('Unknown message type:', data.type);
+            console.log('Unknown event type:', type);
+    }
+    
+    if (handlers[type]) {
+        handlers[type](data);
     }
 }
 
@@ -298,7 +337,8 @@ window.ScraperApp = {
     formatDate,
     copyToClipboard,
     downloadData,
-    updateProgress
+    updateProgress,
+    initializeEventStream
 };
 
 // Keyboard shortcuts
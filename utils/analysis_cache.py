@@ -0,0 +1,174 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# SQLite file shared by every process on the host; an empty value keeps the memo in memory only
+DEFAULT_CACHE_PATH = os.environ.get('ANALYSIS_CACHE_PATH', os.path.join('.cache', 'analysis.sqlite3'))
+DEFAULT_MEMORY_ENTRIES = int(os.environ.get('ANALYSIS_CACHE_MEMORY_ENTRIES', 4096))
+DEFAULT_MAX_ROWS = int(os.environ.get('ANALYSIS_CACHE_MAX_ROWS', 200000))
+# The table is trimmed back to max_rows once every this many writes
+PRUNE_EVERY_WRITES = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS text_analysis (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+)
+"""
+
+
+def analysis_key(parts: Iterable[Any]) -> str:
+    """SHA-256 of the inputs an analysis depends on; None counts as ''"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(('' if part is None else str(part)).encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Memo for text analytics results (classifications, NLP features).
+
+    Values are JSON-serializable and stored under (kind, key), where the key
+    hashes every input of the analysis including the version of the rules
+    that produced it, so stale entries are never read; they simply age out.
+    A bounded in-process LRU sits in front of a SQLite table shared by all
+    processes on the host. Storage errors are logged and treated as misses:
+    the cache never fails an analysis. Returned values may be shared, so
+    callers must not mutate them.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 max_rows: int = DEFAULT_MAX_ROWS):
+        self.path = path or None
+        self.memory_entries = max(0, memory_entries)
+        self.max_rows = max_rows
+        self._memory: 'OrderedDict[tuple, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        # sqlite3 connections are per thread
+        if self.path is None:
+            return None
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(SCHEMA)
+            connection.commit()
+            self._local.connection = connection
+        return connection
+
+    def _remember(self, entry: tuple, value: Any) -> None:
+        if not self.memory_entries:
+            return
+        with self._lock:
+            self._memory[entry] = value
+            self._memory.move_to_end(entry)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        """The stored value, or None on a miss"""
+        entry = (kind, key)
+        with self._lock:
+            if entry in self._memory:
+                self._memory.move_to_end(entry)
+                self.hits += 1
+                return self._memory[entry]
+        value = None
+        try:
+            connection = self._connection()
+            if connection is not None:
+                row = connection.execute('SELECT value FROM text_analysis WHERE kind = ? AND key = ?',
+                                         entry).fetchone()
+                value = json.loads(row[0]) if row else None
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.debug(f"[AnalysisCache] Read of {kind} entry failed: {e}")
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+        self._remember(entry, value)
+        return value
+
+    def put(self, kind: str, key: str, value: Any) -> None:
+        self._remember((kind, key), value)
+        try:
+            connection = self._connection()
+            if connection is None:
+                return
+            connection.execute('INSERT OR REPLACE INTO text_analysis (kind, key, value, created_at) VALUES (?, ?, ?, ?)',
+                               (kind, key, json.dumps(value), time.time()))
+            connection.commit()
+            with self._lock:
+                self._writes += 1
+                prune = self._writes % PRUNE_EVERY_WRITES == 0
+            if prune:
+                self.prune()
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            logger.debug(f"[AnalysisCache] Write of {kind} entry failed: {e}")
+
+    def prune(self) -> int:
+        """Delete the oldest rows beyond max_rows; returns how many were removed"""
+        connection = self._connection()
+        if connection is None:
+            return 0
+        (count,) = connection.execute('SELECT COUNT(*) FROM text_analysis').fetchone()
+        excess = count - self.max_rows
+        if excess <= 0:
+            return 0
+        connection.execute('DELETE FROM text_analysis WHERE rowid IN '
+                           '(SELECT rowid FROM text_analysis ORDER BY created_at LIMIT ?)', (excess,))
+        connection.commit()
+        logger.info(f"[AnalysisCache] Pruned {excess} old entries from {self.path}")
+        return excess
+
+    def memoize(self, kind: str, parts: Iterable[Any], compute: Callable[[], Any]) -> Any:
+        """The cached value for ``parts``, or ``compute()`` stored for next time"""
+        key = analysis_key(parts)
+        value = self.get(kind, key)
+        if value is None:
+            value = compute()
+            self.put(kind, key, value)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                    'memory_entries': len(self._memory)}
+
+
+_cache: Optional[AnalysisCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """The process-wide analysis memo, configured from the environment"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AnalysisCache()
+        return _cache
@@ -0,0 +1,215 @@
+import time
+import logging
+import threading
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.taxonomy import (
+    CONTEXT, CONTEXT_WEIGHT, FALLBACK_CATEGORY, GENERAL_PRIMARY_WEIGHT, GENERAL_SECONDARY_WEIGHT,
+    MIN_GENERAL_SCORE, MIN_INDUSTRY_SCORE, MULTIWORD_BONUS, NAME_ONLY_PENALTY, NAME_WEIGHT, PRIMARY,
+    PRIMARY_WEIGHT, SECONDARY, SECONDARY_WEIGHT, TOP_INDUSTRIES, TaxonomyMatcher, confidence_from_score,
+    get_taxonomy_matcher, industry_tags_json
+)
+
+logger = logging.getLogger(__name__)
+
+# Rows scored per matrix product. Hit matrices are float32 rows x indicators,
+# so with the bundled taxonomy (~360 indicators) each one is about 3 MB
+BATCH_ROWS = 2048
+
+
+class BatchClassification(NamedTuple):
+    """Classification of many companies; arrays are aligned with the input rows"""
+    labels: List[str]
+    scores: np.ndarray           # winning category score, 0 for the fallback
+    confidence: np.ndarray       # 0-100, see confidence_from_score
+    industry_scores: np.ndarray  # rows x industries
+    general_scores: np.ndarray   # rows x general categories
+    industries: List[str]
+    generals: List[str]
+    top_industries: List[List[Tuple[str, int]]]  # per row, as in Classification
+    industry_tags: List[str]  # top_industries of each row in Company.industry_tags form
+
+    def to_frame(self, index=None) -> pd.DataFrame:
+        """
+        domain_class, classification_confidence, classification_score,
+        industry_tags and one score column per category ('industry:<name>' and 'general:<name>', as
+        some names are used by both)
+        """
+        frame = pd.DataFrame({
+            'domain_class': self.labels,
+            'classification_confidence': self.confidence,
+            'classification_score': self.scores,
+            'industry_tags': self.industry_tags
+        }, index=index)
+        scores = pd.DataFrame(np.hstack([self.industry_scores, self.general_scores]),
+                              columns=[f'industry:{name}' for name in self.industries] +
+                              [f'general:{name}' for name in self.generals], index=frame.index)
+        return pd.concat([frame, scores], axis=1)
+
+
+class BatchClassifier:
+    """
+    Vectorized TaxonomyMatcher.classify for whole tables.
+
+    Every text is scanned once into a row of a hit matrix (rows x indicators);
+    the taxonomy becomes indicator x category weight matrices, so all category
+    scores of a batch are a few matrix products. Labels are identical to
+    calling ``classify`` row by row.
+    """
+
+    def __init__(self, matcher: TaxonomyMatcher):
+        self.matcher = matcher
+        self.version = matcher.version
+        self.industries = list(matcher.industries)
+        self.generals = list(matcher.generals)
+        patterns = matcher.matcher.patterns
+        index = {pattern: i for i, pattern in enumerate(patterns)}
+        shape = (len(patterns), len(self.industries))
+        # Industry weight of an indicator found in the description, and of one
+        # found only in the domain/name; primary/secondary counts drive the penalty
+        # float32 holds these small integer sums exactly and halves the memory of float64
+        self.description_weights = np.zeros(shape, np.float32)
+        self.name_weights = np.zeros(shape, np.float32)
+        self.primary_counts = np.zeros(shape, np.float32)
+        self.secondary_counts = np.zeros(shape, np.float32)
+        for column, name in enumerate(self.industries):
+            data = matcher.industry_categories[name]
+            for indicator in data.get(PRIMARY, ()):
+                row = index[indicator]
+                bonus = MULTIWORD_BONUS if len(indicator.split()) > 1 else 0
+                self.description_weights[row, column] += PRIMARY_WEIGHT + bonus
+                self.primary_counts[row, column] += 1
+            for indicator in data.get(SECONDARY, ()):
+                row = index[indicator]
+                self.description_weights[row, column] += SECONDARY_WEIGHT
+                self.name_weights[row, column] += NAME_WEIGHT
+                self.secondary_counts[row, column] += 1
+            for indicator in data.get(CONTEXT, ()):
+                self.description_weights[index[indicator], column] += CONTEXT_WEIGHT
+        self.general_counts = np.zeros((len(patterns), len(self.generals)), np.float32)
+        for column, name in enumerate(self.generals):
+            for keyword in matcher.general_categories[name]:
+                self.general_counts[index[keyword], column] += 1
+
+    def _hits(self, texts: Sequence[str]) -> np.ndarray:
+        """Sparse scan of every text, expanded into a dense 0/1 float32 rows x indicators matrix"""
+        rows, columns = [], []
+        for row, text in enumerate(texts):
+            found = self.matcher.matcher.find(text)
+            rows.extend([row] * len(found))
+            columns.extend(found)
+        hits = np.zeros((len(texts), len(self.matcher.matcher.patterns)), np.float32)
+        hits[rows, columns] = 1
+        return hits
+
+    def score(self, primary_texts: Sequence[str], secondary_texts: Sequence[str]):
+        """
+        (industry scores, general scores) as rows x categories arrays, with the
+        same weights as TaxonomyMatcher.score
+        """
+        in_primary = self._hits(primary_texts)
+        # Indicators found only in the domain/name; the description takes precedence
+        name_only = self._hits(secondary_texts) * (1 - in_primary)
+        industry = in_primary @ self.description_weights + name_only @ self.name_weights
+        penalized = (name_only @ self.secondary_counts > 0) & (in_primary @ self.primary_counts == 0)
+        industry = np.where(penalized, np.maximum(0, industry - NAME_ONLY_PENALTY), industry)
+        general = in_primary @ (self.general_counts * GENERAL_PRIMARY_WEIGHT) + \
+            name_only @ (self.general_counts * GENERAL_SECONDARY_WEIGHT)
+        return industry.astype(np.int64), general.astype(np.int64)
+
+    def classify(self, domains: Sequence[str], names: Optional[Sequence[str]] = None,
+                 descriptions: Optional[Sequence[str]] = None, batch_rows: int = BATCH_ROWS,
+                 top_k: int = TOP_INDUSTRIES) -> BatchClassification:
+        """Classify aligned sequences of domains, company names and descriptions"""
+        started = time.perf_counter()
+        count = len(domains)
+        names = names if names is not None else [''] * count
+        descriptions = descriptions if descriptions is not None else [''] * count
+        industry_parts, general_parts = [], []
+        for start in range(0, count, batch_rows):
+            end = start + batch_rows
+            primary_texts = [_text(description).lower() for description in descriptions[start:end]]
+            secondary_texts = [f"{_text(domain).lower()} {_text(name).lower()}"
+                               for domain, name in zip(domains[start:end], names[start:end])]
+            industry, general = self.score(primary_texts, secondary_texts)
+            industry_parts.append(industry)
+            general_parts.append(general)
+        industry_scores = np.vstack(industry_parts) if industry_parts else np.zeros((0, len(self.industries)), np.int64)
+        general_scores = np.vstack(general_parts) if general_parts else np.zeros((0, len(self.generals)), np.int64)
+
+        labels = [FALLBACK_CATEGORY] * count
+        scores = np.zeros(count, np.int64)
+        runners_up = np.zeros(count, np.int64)
+        # argmax picks the first of equal maxima, like max() over the taxonomy order
+        if self.industries:
+            best = industry_scores.argmax(axis=1)
+            best_scores = industry_scores[np.arange(count), best]
+            # Second-highest score per row (equal to the best on a tie)
+            second = (np.sort(industry_scores, axis=1)[:, -2] if len(self.industries) > 1
+                      else np.zeros(count, np.int64))
+            for row in np.flatnonzero(best_scores >= MIN_INDUSTRY_SCORE):
+                labels[row] = self.industries[best[row]]
+                scores[row] = best_scores[row]
+                runners_up[row] = second[row]
+        if self.generals:
+            qualifies = general_scores >= MIN_GENERAL_SCORE
+            first = qualifies.argmax(axis=1)
+            for row in np.flatnonzero(qualifies.any(axis=1) & (scores == 0)):
+                labels[row] = self.generals[first[row]]
+                scores[row] = general_scores[row, first[row]]
+                others = np.delete(general_scores[row], first[row])
+                runners_up[row] = others.max() if others.size else 0
+        confidence = np.array([confidence_from_score(score, runner_up) for score, runner_up in zip(scores, runners_up)],
+                              dtype=np.int64)
+        # Stable descending order keeps taxonomy order among equal scores
+        ranked = np.argsort(-industry_scores, axis=1, kind='stable')[:, :top_k]
+        top_industries = [
+            [(self.industries[column], int(industry_scores[row, column]))
+             for column in ranked[row] if industry_scores[row, column] > 0]
+            for row in range(count)
+        ]
+        logger.info(f"Batch-classified {count} companies with taxonomy version {self.version} "
+                    f"in {time.perf_counter() - started:.3f}s")
+        return BatchClassification(labels, scores, confidence, industry_scores, general_scores,
+                                   self.industries, self.generals, top_industries,
+                                   [industry_tags_json(top) for top in top_industries])
+
+    def classify_frame(self, df: pd.DataFrame, domain_column: str = 'domain', name_column: str = 'name',
+                       description_column: str = 'description') -> pd.DataFrame:
+        """
+        Classify every row of ``df``; missing columns count as empty. Returns
+        BatchClassification.to_frame aligned with ``df.index``.
+        """
+        def column(name: str) -> List:
+            return df[name].tolist() if name in df.columns else [''] * len(df)
+
+        result = self.classify(column(domain_column), column(name_column), column(description_column))
+        return result.to_frame(index=df.index)
+
+
+def _text(value) -> str:
+    # NULL columns and NaN cells count as empty text
+    return value if isinstance(value, str) else ''
+
+
+_classifier: Optional[BatchClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_batch_classifier() -> BatchClassifier:
+    """A BatchClassifier for the current taxonomy, rebuilt when the taxonomy is reloaded"""
+    global _classifier
+    matcher = get_taxonomy_matcher()
+    with _classifier_lock:
+        if _classifier is None or _classifier.matcher is not matcher:
+            _classifier = BatchClassifier(matcher)
+        return _classifier
+
+
+def classify_frame(df: pd.DataFrame, **columns) -> pd.DataFrame:
+    """Batch-classify a DataFrame with the current taxonomy; see BatchClassifier.classify_frame"""
+    return get_batch_classifier().classify_frame(df, **columns)
+
@@ -0,0 +1,118 @@
+import time
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the circuit opens and
+    ``allow`` refuses work. Once ``cooldown_seconds`` have passed a single
+    trial call is let through (half-open): success closes the circuit, failure
+    opens it again for another cooldown.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown_seconds: float = 300.0):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_seconds = max(0.0, float(cooldown_seconds))
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.last_reason = ''
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a call may proceed now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self._trial_in_flight or time.monotonic() < self._opened_at + self.cooldown_seconds:
+                return False
+            self.state = HALF_OPEN
+            self._trial_in_flight = True
+            logger.info(f"[CircuitBreaker] {self.name}: cooldown over, letting a trial request through")
+            return True
+
+    def wait(self, timeout: Optional[float] = None, heartbeat: Optional[Callable[[float], None]] = None,
+             heartbeat_seconds: float = 30.0) -> bool:
+        """
+        Block until ``allow`` succeeds; False if ``timeout`` seconds pass first.
+        While waiting, ``heartbeat(retry_after)`` is called right away and then
+        every ``heartbeat_seconds``, so a long pause still shows signs of life.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        next_heartbeat = time.monotonic()
+        while not self.allow():
+            delay = max(self.retry_after(), 0.5)
+            if heartbeat is not None:
+                now = time.monotonic()
+                if now >= next_heartbeat:
+                    heartbeat(self.retry_after())
+                    next_heartbeat = now + heartbeat_seconds
+                delay = min(delay, max(next_heartbeat - now, 0.5))
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                delay = min(delay, remaining)
+            time.sleep(delay)
+        return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"[CircuitBreaker] {self.name}: closed again")
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self, reason: str = '') -> bool:
+        """Count a failure; returns True if this call opened the circuit"""
+        with self._lock:
+            self.failures += 1
+            self.last_reason = reason or self.last_reason
+            self._trial_in_flight = False
+            if self.state == OPEN:
+                return False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.trips += 1
+                self._opened_at = time.monotonic()
+                logger.warning(f"[CircuitBreaker] {self.name}: opened after {self.failures} failures ({self.last_reason})")
+                return True
+            return False
+
+    def record_neutral(self) -> None:
+        """An outcome that says nothing either way; frees the half-open trial slot"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = OPEN
+                self._trial_in_flight = False
+
+    def retry_after(self) -> float:
+        """Seconds until the next trial is allowed (0 when closed)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return 0.0
+            return max(0.0, self._opened_at + self.cooldown_seconds - time.monotonic())
+
+    def snapshot(self) -> Dict:
+        return {
+            'name': self.name,
+            'state': self.state,
+            'failures': self.failures,
+            'trips': self.trips,
+            'reason': self.last_reason,
+            'retry_after': round(self.retry_after(), 1)
+        }
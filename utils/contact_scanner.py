@@ -0,0 +1,121 @@
+import re
+from html import unescape
+from typing import Iterable, List, NamedTuple
+from urllib.parse import unquote
+
+# One precompiled alternation, so a page is scanned for every kind of contact
+# detail in a single pass. Links come first so 'mailto:x@y.com' is reported as
+# a link rather than as a bare address; 'Tel:' in text counts as a link too.
+_EMAIL = r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}'
+# Bare digit runs are everywhere in HTML (SVG paths, IDs, prices), so an
+# unlabelled phone number must start with + or an (area code)
+_PHONE = r'(?:\+\d{1,3}[\s.-]?(?:\(\d{1,5}\)[\s.-]?)?|\(\d{2,5}\)[\s.-]?)\d{1,5}(?:[\s.-]?\d{2,5}){1,4}'
+_LABELLED_PHONE = r'\+?[\d(][\d\s().-]{6,24}\d'
+CONTACT_PATTERN = re.compile(
+    r'(?<![a-z])mailto:(?P<mailto>[^"\'\s?<>]{3,254})'
+    r'|(?<![a-z])tel:(?P<tel>[^"\'<>]{1,40}?)(?=["\'<>]|$)'
+    r'|(?<![a-z])(?:telephone|phone|mobile|call us)\s*(?:no\.?|number)?\s*[:.-]?\s*(?P<labelled>' + _LABELLED_PHONE + r')'
+    r'|(?<![\w.%+-])(?P<email>' + _EMAIL + r')\b'
+    r'|(?<![\w+])(?P<phone>' + _PHONE + r')(?!\w)',
+    re.IGNORECASE
+)
+
+# Matches never get longer than this, so it is all the context a chunk boundary needs
+MAX_MATCH_CHARS = 320
+SCAN_CHUNK_CHARS = 64 * 1024
+
+# Address-looking asset names such as logo@2x.png
+ASSET_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.css', '.js')
+MIN_PHONE_DIGITS = 9
+MAX_PHONE_DIGITS = 15
+
+
+class Contacts(NamedTuple):
+    """Contact details found in a page, each list deduplicated in page order"""
+    emails: List[str]
+    mailto_emails: List[str]
+    phones: List[str]
+    tel_phones: List[str]
+
+
+def _clean_email(value: str) -> str:
+    email = unquote(unescape(value)).strip().strip('.').lower()
+    if '@' not in email or email.endswith(ASSET_SUFFIXES):
+        return ''
+    return email
+
+
+def _clean_phone(value: str) -> str:
+    phone = ' '.join(unquote(unescape(value)).split()).strip(' .-')
+    digits = sum(c.isdigit() for c in phone)
+    return phone if MIN_PHONE_DIGITS <= digits <= MAX_PHONE_DIGITS else ''
+
+
+class ContactScanner:
+    """
+    Incremental scanner for emails, phone numbers and mailto:/tel: links.
+
+    Feed page text in chunks of any size with ``feed`` (``contacts`` peeks at
+    the matches so far) and call ``result`` at the end; memory use is bounded
+    by the chunk size plus MAX_MATCH_CHARS of carried-over context, and every
+    character is scanned about once.
+    """
+
+    def __init__(self):
+        self._tail = ''
+        self._seen = set()
+        self.emails: List[str] = []
+        self.mailto_emails: List[str] = []
+        self.phones: List[str] = []
+        self.tel_phones: List[str] = []
+
+    def _add(self, kind: str, value: str) -> None:
+        if kind in ('mailto', 'email'):
+            value = _clean_email(value)
+            target = self.mailto_emails if kind == 'mailto' else self.emails
+        else:
+            value = _clean_phone(value)
+            kind = 'tel' if kind == 'tel' else 'phone'
+            target = self.tel_phones if kind == 'tel' else self.phones
+        if value and (kind, value) not in self._seen:
+            self._seen.add((kind, value))
+            target.append(value)
+
+    def _scan(self, final: bool) -> None:
+        text = self._tail
+        # Matches ending this close to the end may continue in the next chunk
+        safe_end = len(text) if final else len(text) - MAX_MATCH_CHARS
+        keep_from = max(safe_end, 0)
+        for match in CONTACT_PATTERN.finditer(text):
+            if match.end() > safe_end and not final:
+                keep_from = min(keep_from, match.start())
+                break
+            self._add(match.lastgroup, match.group(match.lastgroup))
+        self._tail = '' if final else text[keep_from:]
+
+    def feed(self, chunk: str) -> None:
+        self._tail += chunk
+        if len(self._tail) > 2 * MAX_MATCH_CHARS:
+            self._scan(final=False)
+
+    def contacts(self) -> Contacts:
+        """
+        What has been found so far, without ending the scan; the last
+        MAX_MATCH_CHARS fed may still hold more
+        """
+        return Contacts(self.emails, self.mailto_emails, self.phones, self.tel_phones)
+
+    def result(self) -> Contacts:
+        self._scan(final=True)
+        return Contacts(self.emails, self.mailto_emails, self.phones, self.tel_phones)
+
+
+def scan_contacts(chunks: Iterable[str]) -> Contacts:
+    """Scan a page given as a string or as an iterable of text chunks"""
+    scanner = ContactScanner()
+    if isinstance(chunks, str):
+        text = chunks
+        chunks = (text[i:i + SCAN_CHUNK_CHARS] for i in range(0, len(text), SCAN_CHUNK_CHARS))
+    for chunk in chunks:
+        scanner.feed(chunk)
+    return scanner.result()
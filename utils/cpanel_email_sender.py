@@ -7,9 +7,31 @@ from email import encoders
 import logging
 from typing import Dict, List, Optional
 import re
+import socket
+
+from utils.retry import Retrier, RetryPolicy
 
 logger = logging.getLogger(__name__)
 
+SMTP_TIMEOUT = 30
+
+
+class TemporarySMTPError(Exception):
+    """A 4xx SMTP reply: the server asks us to try again later"""
+
+
+# Connection problems and 4xx replies are retried; authentication failures and
+# permanent (5xx) rejections are not
+SMTP_RETRIER = Retrier(
+    'smtp',
+    rules=[
+        ((smtplib.SMTPAuthenticationError,), None),
+        ((smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, TemporarySMTPError,
+          socket.timeout, ConnectionError), RetryPolicy(max_attempts=3, base_delay=2.0, max_delay=20.0)),
+    ],
+    deadline=120
+)
+
 class CPanelEmailSender:
     """
     Send personalized emails through cPanel webmail using SMTP
@@ -108,11 +130,7 @@ class CPanelEmailSender:
             message.attach(part2)
             
             # Send the email
-            context = ssl.create_default_context()
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls(context=context)
-                server.login(self.email, self.password)
-                server.sendmail(self.email, recipient_email, message.as_string())
+            SMTP_RETRIER.run(lambda: self._deliver(recipient_email, message.as_string()), description=recipient_email)
                 
             logger.info(f"Email sent successfully to {recipient_email} ({company_name})")
             return True
@@ -121,6 +139,26 @@ class CPanelEmailSender:
             logger.error(f"Failed to send email to {recipient_email}: {e}")
             return False
     
+    def _deliver(self, recipient_email: str, message: str) -> None:
+        """One SMTP session; a failure after the message was accepted is not an error"""
+        context = ssl.create_default_context()
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=SMTP_TIMEOUT)
+        try:
+            server.starttls(context=context)
+            server.login(self.email, self.password)
+            try:
+                server.sendmail(self.email, recipient_email, message)
+            except smtplib.SMTPResponseException as e:
+                if 400 <= e.smtp_code < 500:
+                    raise TemporarySMTPError(f"{e.smtp_code} {e.smtp_error!r}") from e
+                raise
+        finally:
+            # Never let a failed QUIT turn a delivered message into a retry
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+    
     def send_bulk_emails(self, email_data: List[Dict], delay_seconds: float = 5.0) -> Dict[str, int]:
         """
         Send emails to multiple recipients with delay between sends
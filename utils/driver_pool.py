@@ -0,0 +1,510 @@
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = int(os.environ.get('DRIVER_POOL_SIZE', 2))
+DEFAULT_MAX_PAGES = int(os.environ.get('DRIVER_MAX_PAGES', 50))
+# Where the chromedriver that worked is remembered between processes;
+# setup_chromedriver.py fills it in at image build time
+DRIVER_RESOLUTION_FILE = os.environ.get('CHROMEDRIVER_RESOLUTION_FILE', os.path.join('.cache', 'chromedriver.json'))
+
+
+class BrowserProfile(NamedTuple):
+    """How pooled browsers load pages"""
+    name: str
+    page_load_strategy: str = 'normal'
+    block_images: bool = False
+    blocked_url_patterns: Tuple[str, ...] = ()
+
+
+FULL_PROFILE = BrowserProfile('full')
+
+# The LinkedIn scraper only reads text nodes and meta tags, so the lean profile
+# returns at DOMContentLoaded and never downloads images, fonts, media or
+# trackers. CDP request interception by resource type (Fetch.requestPaused)
+# needs an event loop that Selenium's CDP bridge doesn't have, so resource
+# types are blocked through content settings and URL patterns instead.
+LEAN_PROFILE = BrowserProfile(
+    'lean',
+    page_load_strategy='eager',
+    block_images=True,
+    blocked_url_patterns=(
+        # images
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+        '*media.licdn.com/dms/image*',
+        # fonts
+        '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+        # video and audio
+        '*.mp4', '*.webm', '*.m3u8', '*.mp3', '*dms.licdn.com/playlist*',
+        # analytics and ads
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+        '*px.ads.linkedin.com*', '*li.protechts.net*', '*bat.bing.com*', '*connect.facebook.net*',
+        '*/li/track*', '*/collect?*'
+    )
+)
+
+def get_browser_profile(lean: bool = False) -> BrowserProfile:
+    return LEAN_PROFILE if lean else FULL_PROFILE
+
+
+def build_chrome_options(user_agent: str = 'Mozilla/5.0', profile: BrowserProfile = FULL_PROFILE) -> Options:
+    """
+    Build the headless, low-fingerprint Chrome options used for LinkedIn pages
+    """
+    options = Options()
+    options.page_load_strategy = profile.page_load_strategy
+
+    # Set Chrome binary path from environment if available
+    chrome_bin = os.environ.get('CHROME_BIN', '/usr/bin/google-chrome')
+    options.binary_location = chrome_bin
+
+    # Basic Chrome options
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-software-rasterizer')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--disable-infobars')
+    options.add_argument('--disable-notifications')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--start-maximized')
+    options.add_argument('--disable-web-security')
+    options.add_argument('--allow-running-insecure-content')
+    options.add_argument('--disable-setuid-sandbox')
+    options.add_argument('--disable-browser-side-navigation')
+    options.add_argument('--disable-client-side-phishing-detection')
+    options.add_argument('--disable-component-update')
+    options.add_argument('--disable-features=IsolateOrigins,site-per-process')
+    options.add_argument('--ignore-certificate-errors')
+    options.add_argument('--log-level=3')
+    options.add_argument('--output=/dev/null')
+    # Port 0 lets Chrome pick a free port so pooled browsers don't collide
+    options.add_argument('--remote-debugging-port=0')
+    options.add_argument(f'user-agent={user_agent}')
+
+    # Experimental options
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    if profile.block_images:
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+
+    # Log the Chrome binary being used
+    logger.info(f"[Selenium] Using Chrome binary at: {chrome_bin}")
+    if not os.path.exists(chrome_bin):
+        logger.warning(f"[Selenium] Chrome binary not found at: {chrome_bin}")
+
+    return options
+
+
+def _apply_stealth(driver, user_agent: str) -> None:
+    """Configure browser to look more like a regular user"""
+    try:
+        # Hide WebDriver
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+            'source': """
+            Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+            window.navigator.chrome = { runtime: {} };
+            """
+        })
+
+        # Set user agent and other browser properties
+        driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+            'userAgent': user_agent,
+            'platform': 'Linux x86_64',
+            'acceptLanguage': 'en-US,en;q=0.9',
+            'userAgentMetadata': {
+                'platform': 'Linux',
+                'platformVersion': '5.4.0',
+                'architecture': 'x86',
+                'model': '',
+                'mobile': False
+            }
+        })
+
+        # Additional anti-detection measures
+        driver.execute_script("""
+            Object.defineProperty(navigator, 'languages', {
+                get: () => ['en-US', 'en', 'fr']
+            });
+            Object.defineProperty(navigator, 'plugins', {
+                get: () => [1, 2, 3, 4, 5]
+            });
+            Object.defineProperty(navigator, 'permissions', {
+                get: () => ({
+                    query: () => Promise.resolve({ state: 'granted' })
+                })
+            });
+        """)
+
+    except Exception as cdp_error:
+        logger.warning(f"CDP commands failed: {str(cdp_error)}")
+        # Continue even if CDP commands fail
+
+
+def _apply_request_blocking(driver, profile: BrowserProfile) -> None:
+    """Block the profile's URL patterns for every request this browser makes"""
+    if not profile.blocked_url_patterns:
+        return
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(profile.blocked_url_patterns)})
+    except Exception as cdp_error:
+        logger.warning(f"Could not enable request blocking: {str(cdp_error)}")
+
+
+class DriverBinary(NamedTuple):
+    """A chromedriver (and optionally a browser binary) that has launched Chrome"""
+    strategy: str
+    driver_path: str
+    chrome_binary: Optional[str] = None
+
+
+def _chrome_binary_strategy() -> DriverBinary:
+    from webdriver_manager.chrome import ChromeDriverManager
+    return DriverBinary('chrome', ChromeDriverManager().install())
+
+
+def _chromium_binary_strategy() -> DriverBinary:
+    from webdriver_manager.chrome import ChromeDriverManager
+    from webdriver_manager.core.utils import ChromeType
+    return DriverBinary('chromium', ChromeDriverManager(chrome_type=ChromeType.CHROMIUM).install())
+
+
+def _direct_binary_strategy() -> DriverBinary:
+    return DriverBinary(
+        'direct', os.environ.get('CHROMEDRIVER_PATH', '/usr/local/bin/chromedriver'), '/usr/bin/google-chrome'
+    )
+
+
+# Tried in order until one launches a browser
+DRIVER_STRATEGIES: Tuple[Tuple[str, Callable[[], DriverBinary]], ...] = (
+    ('chrome', _chrome_binary_strategy),
+    ('chromium', _chromium_binary_strategy),
+    ('direct', _direct_binary_strategy)
+)
+
+_resolved_driver: Optional[DriverBinary] = None
+_resolve_lock = threading.Lock()
+
+
+def load_driver_resolution(path: str = DRIVER_RESOLUTION_FILE) -> Optional[DriverBinary]:
+    """The remembered chromedriver, or None if there is none or its binary is gone"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            binary = DriverBinary(**json.load(f))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"[Selenium] Ignoring unreadable chromedriver resolution {path}: {e}")
+        return None
+    return binary if os.path.exists(binary.driver_path) else None
+
+
+def save_driver_resolution(binary: DriverBinary, path: str = DRIVER_RESOLUTION_FILE) -> None:
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(binary._asdict(), f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"[Selenium] Could not remember the chromedriver in {path}: {e}")
+
+
+def _launch(binary: DriverBinary, options: Options):
+    if binary.chrome_binary:
+        options.binary_location = binary.chrome_binary
+    return webdriver.Chrome(service=ChromeService(executable_path=binary.driver_path), options=options)
+
+
+def resolve_chromedriver(options: Options):
+    """
+    Try every strategy in DRIVER_STRATEGIES and return (driver, DriverBinary)
+    for the first one that launches a browser. Raises RuntimeError if all fail.
+    """
+    errors = []
+    for name, strategy in DRIVER_STRATEGIES:
+        started = time.perf_counter()
+        try:
+            logger.info(f"[Selenium] Resolving chromedriver with the {name} strategy...")
+            binary = strategy()
+            driver = _launch(binary, options)
+        except Exception as e:
+            logger.warning(f"[Selenium] {name} strategy failed after {time.perf_counter() - started:.2f}s: {e}")
+            errors.append(f"{name}: {e}")
+            continue
+        logger.info(f"[Selenium] Resolved chromedriver via {name} ({binary.driver_path}) "
+                    f"in {time.perf_counter() - started:.2f}s")
+        return driver, binary
+    error_msg = f"All WebDriver initialization attempts failed. {' | '.join(errors)}"
+    logger.error(error_msg)
+    raise RuntimeError(error_msg)
+
+
+def get_resolved_chromedriver() -> Optional[DriverBinary]:
+    """The chromedriver this process uses, loading a remembered one on first call"""
+    global _resolved_driver
+    if _resolved_driver is None:
+        with _resolve_lock:
+            if _resolved_driver is None:
+                _resolved_driver = load_driver_resolution()
+                if _resolved_driver is not None:
+                    logger.info(f"[Selenium] Using remembered chromedriver via {_resolved_driver.strategy} "
+                                f"({_resolved_driver.driver_path})")
+    return _resolved_driver
+
+
+def create_chrome_driver(user_agent: str = 'Mozilla/5.0', profile: BrowserProfile = FULL_PROFILE):
+    """
+    Start a configured headless Chrome. The chromedriver is resolved once per
+    process (Chrome, Chromium, then the direct chromedriver path) and reused;
+    if the remembered one stops working it is resolved again. Raises
+    RuntimeError if every strategy fails.
+    """
+    global _resolved_driver
+    options = build_chrome_options(user_agent, profile)
+    started = time.perf_counter()
+    binary = get_resolved_chromedriver()
+    driver = None
+    if binary is not None:
+        try:
+            driver = _launch(binary, options)
+        except Exception as e:
+            logger.warning(f"[Selenium] Chromedriver via {binary.strategy} failed, resolving again: {e}")
+    if driver is None:
+        with _resolve_lock:
+            if _resolved_driver is not None and _resolved_driver != binary:
+                # Another thread resolved a new chromedriver while this one waited
+                binary = _resolved_driver
+                driver = _launch(binary, options)
+            else:
+                _resolved_driver = None
+                driver, binary = resolve_chromedriver(options)
+                _resolved_driver = binary
+                save_driver_resolution(binary)
+    logger.info(f"[Selenium] Browser started via {binary.strategy} in {time.perf_counter() - started:.2f}s")
+
+    driver.set_page_load_timeout(30)
+    _apply_stealth(driver, user_agent)
+    _apply_request_blocking(driver, profile)
+    return driver
+
+
+class PooledDriver:
+    """A WebDriver checked out of a DriverPool, with its usage counters"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages_served = 0
+        self.created_at = time.monotonic()
+
+
+class DriverPool:
+    """
+    Process-wide pool of warm headless Chrome instances.
+
+    Drivers are created lazily up to ``size``, health-checked when borrowed and
+    recycled after ``max_pages`` pages or as soon as they are found broken.
+    One condition guards the slot count and the idle drivers, and is notified
+    whenever a driver comes back or a slot frees up (a failed start, a
+    recycled browser), so a waiting borrower takes whichever comes first.
+    """
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, max_pages: int = DEFAULT_MAX_PAGES,
+                 user_agent: str = 'Mozilla/5.0', factory: Optional[Callable] = None,
+                 profile: BrowserProfile = FULL_PROFILE):
+        self.size = max(1, int(size))
+        self.max_pages = max(1, int(max_pages))
+        self.user_agent = user_agent
+        self.profile = profile
+        self.factory = factory or (lambda: create_chrome_driver(self.user_agent, self.profile))
+        # Most recently returned driver last, so the warmest one is reused first
+        self._idle: List[PooledDriver] = []
+        self._available = threading.Condition()
+        self._created = 0
+        self._closed = False
+
+    def _reserve_slot(self) -> bool:
+        with self._available:
+            if self._closed or self._created >= self.size:
+                return False
+            self._created += 1
+            return True
+
+    def _release_slot(self) -> None:
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    def _put_idle(self, pooled: PooledDriver) -> None:
+        with self._available:
+            self._idle.append(pooled)
+            self._available.notify()
+
+    def grow(self, size: int) -> None:
+        """Raise the pool size; waiting borrowers may start the new browsers"""
+        with self._available:
+            if size > self.size:
+                self.size = size
+                self._available.notify_all()
+
+    def _spawn(self) -> PooledDriver:
+        start = time.monotonic()
+        try:
+            driver = self.factory()
+        except Exception:
+            self._release_slot()
+            raise
+        logger.info(f"[DriverPool] Started browser in {time.monotonic() - start:.2f}s")
+        return PooledDriver(driver)
+
+    def _discard(self, pooled: PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.debug(f"[DriverPool] Error quitting driver: {e}")
+        self._release_slot()
+
+    @staticmethod
+    def is_healthy(pooled: PooledDriver) -> bool:
+        """Cheap liveness probe: a crashed browser or dead session raises here"""
+        try:
+            pooled.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def warm_up(self, count: Optional[int] = None) -> int:
+        """Start up to ``count`` browsers in parallel so the first pages don't pay startup cost"""
+        count = self.size if count is None else min(count, self.size)
+        with self._available:
+            missing = max(0, count - self._created)
+        started = []
+
+        def start_one():
+            if not self._reserve_slot():
+                return
+            try:
+                started.append(self._spawn())
+            except Exception as e:
+                logger.error(f"[DriverPool] Warm-up failed: {e}")
+
+        threads = [threading.Thread(target=start_one, daemon=True) for _ in range(missing)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for pooled in started:
+            self._put_idle(pooled)
+        if started:
+            logger.info(f"[DriverPool] Warmed up {len(started)} browser(s)")
+        return len(started)
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledDriver:
+        """Check out a healthy driver, starting one if the pool has spare capacity"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._available:
+                while True:
+                    if self._idle:
+                        pooled = self._idle.pop()
+                        spawn = False
+                        break
+                    if self._closed:
+                        raise RuntimeError('The WebDriver pool has been shut down')
+                    if self._created < self.size:
+                        self._created += 1
+                        spawn = True
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError('Timed out waiting for a pooled WebDriver')
+                    self._available.wait(remaining)
+            if spawn:
+                # Started outside the lock; a failed start frees the slot again
+                return self._spawn()
+            if self.is_healthy(pooled):
+                return pooled
+            logger.warning("[DriverPool] Discarding unhealthy browser")
+            self._discard(pooled)
+
+    def release(self, pooled: PooledDriver, broken: bool = False) -> None:
+        """Return a driver to the pool, recycling it if it is broken or worn out"""
+        pooled.pages_served += 1
+        if broken or self._closed or pooled.pages_served >= self.max_pages:
+            reason = 'broken' if broken else f'served {pooled.pages_served} pages'
+            logger.info(f"[DriverPool] Recycling browser ({reason})")
+            self._discard(pooled)
+            return
+        self._put_idle(pooled)
+
+    @contextmanager
+    def borrow(self, timeout: Optional[float] = None):
+        """Context manager yielding a raw WebDriver; exceptions mark it broken"""
+        pooled = self.acquire(timeout=timeout)
+        broken = False
+        try:
+            yield pooled.driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(pooled, broken=broken)
+
+    def shutdown(self) -> None:
+        """Quit every idle driver; drivers still checked out are quit on release"""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+
+_pools: Dict[Tuple, DriverPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_driver_pool(user_agent: str = 'Mozilla/5.0', size: Optional[int] = None,
+                    max_pages: Optional[int] = None, profile: BrowserProfile = FULL_PROFILE) -> DriverPool:
+    """Return the process-wide pool for ``user_agent`` and ``profile``, creating it on first use"""
+    key = (user_agent, profile.name)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = DriverPool(
+                size=size or DEFAULT_POOL_SIZE,
+                max_pages=max_pages or DEFAULT_MAX_PAGES,
+                user_agent=user_agent,
+                profile=profile
+            )
+            _pools[key] = pool
+        elif size and size > pool.size:
+            pool.grow(size)
+        return pool
+
+
+def shutdown_driver_pools() -> None:
+    """Quit all pooled browsers (registered with atexit)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_driver_pools)
@@ -1,13 +1,25 @@
-from groq import Groq
+from groq import Groq, APIConnectionError, InternalServerError, RateLimitError
 import os
 import logging
 import re
 from typing import List, Dict, Optional
+from utils.retry import Retrier, RetryPolicy
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rate limits, dropped connections/timeouts and 5xx answers are retried; bad
+# requests and auth errors fail at once
+LLM_RETRIER = Retrier(
+    'groq',
+    rules=[
+        ((RateLimitError,), RetryPolicy(max_attempts=4, base_delay=2.0, max_delay=30.0)),
+        ((APIConnectionError, InternalServerError), RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=10.0)),
+    ],
+    deadline=90
+)
+
 class GroqEmailGenerator:
     """
     Generate personalized emails using the Groq API from "Prabisha Consulting Pvt. Ltd."
@@ -19,8 +31,8 @@ class GroqEmailGenerator:
         if not self.api_key:
             raise ValueError("Groq API key is required. Provide it as an argument or set the GROQ_API_KEY environment variable.")
         try:
-            # Initialize Groq client with only the api_key parameter
-            self.client = Groq(api_key=self.api_key)
+            # Retries are handled by LLM_RETRIER, so the client must not retry on its own
+            self.client = Groq(api_key=self.api_key, max_retries=0)
         except Exception as e:
             logger.error(f"Failed to initialize Groq client: {str(e)}")
             raise
@@ -56,9 +68,12 @@ class GroqEmailGenerator:
         """
 
         try:
-            chat_completion = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama3-8b-8192",  # Or another suitable model
+            chat_completion = LLM_RETRIER.run(
+                lambda: self.client.chat.completions.create(
+                    messages=[{"role": "user", "content": prompt}],
+                    model="llama3-8b-8192",  # Or another suitable model
+                ),
+                description=company_name
             )
             generated_email = chat_completion.choices[0].message.content
             return generated_email
@@ -0,0 +1,202 @@
+import codecs
+import asyncio
+import logging
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, NamedTuple, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.page_cache import PageCache
+from utils.rate_limiter import HostRateLimiter
+from utils.retry import Retrier, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+POOL_CONNECTIONS = 64   # distinct hosts kept alive
+POOL_MAXSIZE = 16       # concurrent keep-alive sockets per host
+MAX_CONCURRENCY = 32    # in-flight requests across all async callers
+
+# Dropped connections, timeouts and gateway errors are retried; other status
+# codes (including LinkedIn's 429/999 blocks) are returned to the caller as is
+RETRYABLE_STATUS_CODES = (502, 503, 504)
+HTTP_RETRIER = Retrier(
+    'http',
+    rules=[
+        ((requests.exceptions.SSLError, requests.exceptions.InvalidURL), None),
+        ((requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError),
+         RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=4.0)),
+    ],
+    result_policy=RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=8.0)
+)
+
+# Content types worth reading when scanning a site for contact details
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+READ_CHUNK_BYTES = 64 * 1024
+
+_session = None
+_executor = None
+_init_lock = threading.Lock()
+
+
+class PageResponse(NamedTuple):
+    """The parts of an HTTP response the scrapers use"""
+    url: str
+    status_code: int
+    text: str
+    final_url: str
+    content_type: str = ''
+    truncated: bool = False  # the body was cut off at max_bytes
+    stopped: bool = False    # reading was stopped early by on_text or stop_event
+
+
+def get_session() -> requests.Session:
+    """
+    Shared requests session with a keep-alive connection pool, so repeated
+    requests to a host reuse DNS, TCP and TLS setup
+    """
+    global _session
+    if _session is None:
+        with _init_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                _session = session
+    return _session
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _init_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix='http-fetch')
+    return _executor
+
+
+def _read_body(response: requests.Response, max_bytes: Optional[int],
+               on_text: Optional[Callable[[str], bool]] = None, keep_text: bool = True,
+               stop_event: Optional[threading.Event] = None):
+    """
+    Read a streamed body chunk by chunk, stopping after ``max_bytes``. Each
+    decoded chunk is passed to ``on_text``; reading stops early when it returns
+    True or ``stop_event`` is set. Returns (text, truncated, stopped), where
+    text is '' unless ``keep_text``.
+    """
+    # Same fallback as response.text for text/* without a charset; UTF-8 otherwise
+    try:
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    parts = []
+    size = 0
+    truncated = stopped = False
+    for chunk in response.iter_content(READ_CHUNK_BYTES):
+        if stop_event is not None and stop_event.is_set():
+            stopped = True
+            break
+        if max_bytes is not None and size + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - size]
+            truncated = True
+        size += len(chunk)
+        text = decoder.decode(chunk)
+        if keep_text:
+            parts.append(text)
+        if on_text is not None and text and on_text(text):
+            stopped = True
+            break
+        if truncated:
+            break
+    if not stopped:
+        text = decoder.decode(b'', final=True)
+        if keep_text:
+            parts.append(text)
+        if on_text is not None and text:
+            on_text(text)
+    return ''.join(parts), truncated, stopped
+
+
+def fetch(url: str, timeout: float = 10, headers: Optional[Dict[str, str]] = None,
+          cache: Optional[PageCache] = None, rate_limiter: Optional[HostRateLimiter] = None,
+          max_bytes: Optional[int] = None, content_types: Optional[Sequence[str]] = None,
+          on_text: Optional[Callable[[str], bool]] = None,
+          stop_event: Optional[threading.Event] = None) -> PageResponse:
+    """
+    Blocking GET through the shared session. With a ``cache``, fresh entries are
+    served from disk and successful responses are stored; a ``rate_limiter`` is
+    only consulted when the request actually goes to the network. Transient
+    failures are retried with backoff for up to three times ``timeout``.
+
+    The body is streamed: at most ``max_bytes`` are read (the response is then
+    marked truncated), and when ``content_types`` is given a response of any
+    other declared type comes back with an empty text and its body unread.
+
+    With ``on_text`` the decoded body of a 200 response (or a cached page) is
+    handed over chunk by chunk as it arrives, and the text is only kept when
+    it is also cached; other responses are not read. The connection is closed
+    as soon as ``on_text`` returns True or ``stop_event`` is set (a set event
+    also skips the request altogether), and the response is marked stopped
+    and never cached. A retried attempt feeds the body again from the start.
+    """
+    if cache is not None:
+        entry = cache.get(url)
+        if entry is not None:
+            if on_text is not None and entry['text']:
+                on_text(entry['text'])
+            return PageResponse(url, entry['status_code'], entry['text'], entry['final_url'])
+
+    def attempt():
+        if stop_event is not None and stop_event.is_set():
+            return PageResponse(url, 0, '', url, stopped=True)
+        if rate_limiter is not None:
+            rate_limiter.acquire(url)
+        with get_session().get(url, headers=headers, timeout=timeout, stream=True) as response:
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if response.status_code in RETRYABLE_STATUS_CODES or (
+                    content_types and content_type and content_type not in content_types) or (
+                    on_text is not None and response.status_code != 200):
+                return PageResponse(url, response.status_code, '', response.url, content_type)
+            text, truncated, stopped = _read_body(response, max_bytes, on_text,
+                                                  keep_text=on_text is None or cache is not None,
+                                                  stop_event=stop_event)
+            if truncated:
+                logger.debug(f"Truncated {url} at {max_bytes} bytes")
+            return PageResponse(url, response.status_code, text, response.url, content_type, truncated, stopped)
+
+    result = HTTP_RETRIER.run(
+        attempt,
+        retry_result=lambda response: response.status_code in RETRYABLE_STATUS_CODES,
+        deadline=timeout * 3,
+        description=url
+    )
+    if cache is not None and result.status_code == 200 and not result.stopped and (not content_types or result.text):
+        cache.put(url, result.text, result.status_code, result.final_url)
+    return result
+
+
+async def fetch_async(url: str, timeout: float = 10, headers: Optional[Dict[str, str]] = None,
+                      cache: Optional[PageCache] = None,
+                      rate_limiter: Optional[HostRateLimiter] = None, max_bytes: Optional[int] = None,
+                      content_types: Optional[Sequence[str]] = None,
+                      on_text: Optional[Callable[[str], bool]] = None,
+                      stop_event: Optional[threading.Event] = None) -> PageResponse:
+    """
+    Awaitable GET. Requests run on a shared bounded thread pool over the pooled
+    session; cancelling the awaiting task drops requests that have not started,
+    while ``stop_event`` also ends the ones already reading (see fetch).
+    ``on_text`` runs on the pool thread.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), partial(
+        fetch, url, timeout, headers, cache, rate_limiter, max_bytes=max_bytes, content_types=content_types,
+        on_text=on_text, stop_event=stop_event
+    ))
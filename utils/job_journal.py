@@ -0,0 +1,77 @@
+import os
+import json
+import uuid
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_DIR = os.environ.get('SCRAPE_JOURNAL_DIR', os.path.join('instance', 'jobs'))
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
+
+
+class ScrapeJournal:
+    """
+    Append-only checkpoint journal for one scrape job (one JSON record per line).
+
+    The first record stores the candidate company list so a resumed job works
+    on the same companies without searching again; every finished company is
+    appended as soon as it completes. A torn final line from a crash is ignored.
+    """
+
+    def __init__(self, job_id: str, directory: str = JOURNAL_DIR):
+        if not job_id or not all(c.isalnum() or c in '-_' for c in job_id):
+            raise ValueError(f"Invalid job id: {job_id!r}")
+        self.job_id = job_id
+        self.directory = directory
+        self.path = os.path.join(directory, f'{job_id}.jsonl')
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> Dict:
+        """Return {'candidates': [...] or None, 'completed': {linkedin_url: company}}"""
+        state = {'candidates': None, 'completed': {}}
+        if not self.exists():
+            return state
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"[Journal] Skipping unreadable line {line_number} in {self.path}")
+                    continue
+                if entry.get('type') == 'candidates':
+                    state['candidates'] = entry.get('companies') or []
+                elif entry.get('type') == 'company' and entry.get('url'):
+                    state['completed'][entry['url']] = entry.get('data') or {}
+        return state
+
+    def _append(self, entry: Dict) -> None:
+        entry['at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        line = json.dumps(entry, default=str) + '\n'
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_candidates(self, companies: List[Dict]) -> None:
+        self._append({'type': 'candidates', 'companies': companies})
+
+    def record_company(self, url: str, company: Dict) -> None:
+        self._append({'type': 'company', 'url': url, 'data': company})
+
+
+def open_journal(job_id: Optional[str]) -> Optional[ScrapeJournal]:
+    return ScrapeJournal(job_id) if job_id else None
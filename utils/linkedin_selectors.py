@@ -0,0 +1,224 @@
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+from bs4 import BeautifulSoup, Comment
+
+# Bump whenever a rule changes so scraped records and logs can be traced back
+# to the markup assumptions they were extracted with
+SELECTOR_VERSION = 1
+
+# Extraction rules for LinkedIn company pages, tried in order per field until
+# one yields a value. Each rule has one locator and an ``attr`` ('text',
+# 'href' or an attribute name):
+#   css            first element matching the CSS selector
+#   dt_label       the <dd> following a <dt> whose text starts with the label
+#   link_text      first link whose text contains the word and points off LinkedIn
+#   text_contains  the element owning the first text node containing the string
+COMPANY_SELECTORS: Dict[str, List[Dict[str, str]]] = {
+    'name': [
+        {'css': 'h1', 'attr': 'text'}
+    ],
+    'description': [
+        {'css': 'meta[name="description"]', 'attr': 'content'}
+    ],
+    'website': [
+        {'css': '[data-test-id="about-us__website"]', 'attr': 'href'},
+        {'dt_label': 'website', 'attr': 'href'},
+        {'dt_label': 'website', 'attr': 'text'},
+        {'link_text': 'website', 'attr': 'href'}
+    ],
+    'size': [
+        {'css': '[data-test-id="about-us__size"] dd', 'attr': 'text'},
+        {'css': '[data-test-id="about-us__size"]', 'attr': 'text'},
+        {'dt_label': 'company size', 'attr': 'text'},
+        {'text_contains': 'employees', 'attr': 'text'}
+    ],
+    'location': [
+        {'css': '[data-test-id="about-us__headquarters"] dd', 'attr': 'text'},
+        {'css': '[data-test-id="about-us__headquarters"]', 'attr': 'text'},
+        {'dt_label': 'headquarters', 'attr': 'text'},
+        {'text_contains': 'Headquarter', 'attr': 'text'},
+        {'text_contains': 'headquarter', 'attr': 'text'}
+    ],
+    'founded': [
+        {'css': '[data-test-id="about-us__foundedOn"] dd', 'attr': 'text'},
+        {'css': '[data-test-id="about-us__foundedOn"]', 'attr': 'text'},
+        {'dt_label': 'founded', 'attr': 'text'},
+        {'text_contains': 'Founded', 'attr': 'text'}
+    ]
+}
+
+SKIPPED_TEXT_PARENTS = ('script', 'style', 'noscript', 'template')
+
+# Runs in the page via execute_script(EXTRACTION_SCRIPT, selector_table()) and
+# returns every field in one round trip; it mirrors extract_from_soup below
+EXTRACTION_SCRIPT = """
+const table = arguments[0];
+const skipped = new Set(table.skipped.map(tag => tag.toUpperCase()));
+const clean = text => (text || '').replace(/\\s+/g, ' ').trim();
+
+function unwrap(href) {
+    try {
+        const url = new URL(href, location.href);
+        if (url.hostname.endsWith('linkedin.com') && url.pathname.includes('redir')) {
+            const target = url.searchParams.get('url');
+            if (target) return target;
+        }
+        return url.href;
+    } catch (e) {
+        return href || '';
+    }
+}
+
+function isExternal(href) {
+    try {
+        const url = new URL(href);
+        return url.protocol.startsWith('http') && !url.hostname.endsWith('linkedin.com');
+    } catch (e) {
+        return false;
+    }
+}
+
+function valueOf(element, attr) {
+    if (!element) return '';
+    if (attr === 'text') return clean(element.innerText || element.textContent);
+    if (attr === 'href') {
+        const link = element.matches('a[href]') ? element : element.querySelector('a[href]');
+        return link ? unwrap(link.getAttribute('href')) : '';
+    }
+    return (element.getAttribute(attr) || '').trim();
+}
+
+function apply(rule) {
+    if (rule.css) {
+        return valueOf(document.querySelector(rule.css), rule.attr);
+    }
+    if (rule.dt_label) {
+        for (const dt of document.querySelectorAll('dt')) {
+            if (!clean(dt.textContent).toLowerCase().startsWith(rule.dt_label)) continue;
+            let dd = dt.nextElementSibling;
+            while (dd && dd.tagName !== 'DD') dd = dd.nextElementSibling;
+            const value = valueOf(dd, rule.attr);
+            if (value) return value;
+        }
+        return '';
+    }
+    if (rule.link_text) {
+        for (const link of document.querySelectorAll('a[href]')) {
+            if (!(link.textContent || '').toLowerCase().includes(rule.link_text)) continue;
+            const href = unwrap(link.getAttribute('href'));
+            if (isExternal(href)) return href;
+        }
+        return '';
+    }
+    if (rule.text_contains) {
+        const walker = document.createTreeWalker(document.body || document.documentElement, NodeFilter.SHOW_TEXT);
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            if (node.data.includes(rule.text_contains) && !skipped.has(node.parentElement.tagName)) {
+                return valueOf(node.parentElement, rule.attr);
+            }
+        }
+        return '';
+    }
+    return '';
+}
+
+const result = {version: table.version};
+for (const [field, rules] of Object.entries(table.fields)) {
+    result[field] = '';
+    for (const rule of rules) {
+        const value = apply(rule);
+        if (value) {
+            result[field] = value;
+            break;
+        }
+    }
+}
+return result;
+"""
+
+
+def selector_table() -> Dict:
+    """The rules as passed to EXTRACTION_SCRIPT"""
+    return {'version': SELECTOR_VERSION, 'skipped': list(SKIPPED_TEXT_PARENTS), 'fields': COMPANY_SELECTORS}
+
+
+def clean_text(text) -> str:
+    return ' '.join((text or '').split())
+
+
+def unwrap_linkedin_redirect(href: str) -> str:
+    """
+    LinkedIn wraps outbound links as /redir/redirect?url=...; return the real target
+    """
+    parsed = urlparse(href or '')
+    if parsed.netloc.endswith('linkedin.com') and 'redir' in parsed.path:
+        target = parse_qs(parsed.query).get('url')
+        if target:
+            return target[0]
+    return href or ''
+
+
+def _is_external(href: str) -> bool:
+    parsed = urlparse(href)
+    return parsed.scheme in ('http', 'https') and not parsed.netloc.endswith('linkedin.com')
+
+
+def _soup_value(element, attr: str) -> str:
+    if element is None:
+        return ''
+    if attr == 'text':
+        return clean_text(element.get_text(' '))
+    if attr == 'href':
+        link = element if element.name == 'a' and element.get('href') else element.find('a', href=True)
+        return unwrap_linkedin_redirect(link['href']) if link else ''
+    return (element.get(attr) or '').strip()
+
+
+def _apply_soup_rule(soup: BeautifulSoup, rule: Dict[str, str]) -> str:
+    if 'css' in rule:
+        return _soup_value(soup.select_one(rule['css']), rule['attr'])
+    if 'dt_label' in rule:
+        for dt in soup.find_all('dt'):
+            if not clean_text(dt.get_text(' ')).lower().startswith(rule['dt_label']):
+                continue
+            value = _soup_value(dt.find_next_sibling('dd'), rule['attr'])
+            if value:
+                return value
+        return ''
+    if 'link_text' in rule:
+        for link in soup.find_all('a', href=True):
+            if rule['link_text'] not in link.get_text(' ').lower():
+                continue
+            href = unwrap_linkedin_redirect(link['href'])
+            if _is_external(href):
+                return href
+        return ''
+    if 'text_contains' in rule:
+        needle = rule['text_contains']
+        node = soup.find(string=lambda text: needle in text and not isinstance(text, Comment)
+                         and text.parent.name not in SKIPPED_TEXT_PARENTS)
+        return _soup_value(node.parent, rule['attr']) if node else ''
+    return ''
+
+
+def extract_from_soup(soup: BeautifulSoup) -> Dict[str, str]:
+    """Apply the selector table to parsed HTML, returning every field ('' when not found)"""
+    fields = {}
+    for field, rules in COMPANY_SELECTORS.items():
+        fields[field] = ''
+        for rule in rules:
+            value = _apply_soup_rule(soup, rule)
+            if value:
+                fields[field] = value
+                break
+    return fields
+
+
+def extract_from_driver(driver) -> Dict[str, str]:
+    """
+    Run the selector table inside the page with a single execute_script call.
+    Returns every field ('' when not found).
+    """
+    result = driver.execute_script(EXTRACTION_SCRIPT, selector_table()) or {}
+    return {field: result.get(field) or '' for field in COMPANY_SELECTORS}
@@ -3,10 +3,19 @@ import logging
 import pandas as pd
 from collections import Counter
 
+from utils.analysis_cache import get_analysis_cache
+
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Bump when an extractor changes so memoized results from the old rules are not reused
+NLP_VERSION = 1
+
+# Columns process_descriptions (and analyze_record) add to a company
+NLP_COLUMNS = ('business_activities', 'keywords', 'technologies', 'sentiment', 'description_length',
+               'company_maturity', 'word_count', 'sentence_count', 'avg_words_per_sentence', 'size_category')
+
 def extract_business_activities(text):
     """
     Extract business activities and services from company descriptions
@@ -293,9 +302,46 @@ def extract_company_size_category(size_text):
     
     return 'Unknown'
 
+def analyze_description(description, founded=''):
+    """
+    Every text feature process_descriptions derives from one description
+    """
+    word_count = len(str(description).split()) if description else 0
+    sentence_count = len(re.split(r'[.!?]+', str(description))) if description else 0
+    return {
+        'business_activities': extract_business_activities(description),
+        'keywords': extract_keywords(description),
+        'technologies': extract_technologies(description),
+        'sentiment': analyze_sentiment(description),
+        'description_length': len(str(description)) if description else 0,
+        'company_maturity': analyze_company_maturity(description, founded),
+        'word_count': word_count,
+        'sentence_count': sentence_count,
+        'avg_words_per_sentence': word_count / max(sentence_count, 1)
+    }
+
+def cached_analysis(description, founded=''):
+    """
+    analyze_description, memoized by description and founding year
+    """
+    return get_analysis_cache().memoize('nlp', (NLP_VERSION, description, founded),
+                                        lambda: analyze_description(description, founded))
+
+def analyze_record(record):
+    """
+    A copy of one company record with the features process_descriptions adds,
+    for companies handled one at a time as the scraper finishes them
+    """
+    record = dict(record)
+    record.update(cached_analysis(record.get('description', ''), record.get('founded', '')))
+    record['size_category'] = extract_company_size_category(record.get('size', ''))
+    return record
+
 def process_descriptions(df):
     """
-    Enhanced description processing with comprehensive NLP features
+    Enhanced description processing with comprehensive NLP features.
+    Features are memoized by description (and founding year), so companies
+    whose text has not changed since they were last analyzed are skipped.
     """
     if df.empty:
         return df
@@ -307,22 +353,17 @@ def process_descriptions(df):
         df['description'] = ''
     
     # Apply enhanced NLP processing
-    df['business_activities'] = df['description'].apply(extract_business_activities)
-    df['keywords'] = df['description'].apply(extract_keywords)
-    df['technologies'] = df['description'].apply(extract_technologies)
-    df['sentiment'] = df['description'].apply(analyze_sentiment)
-    df['description_length'] = df['description'].apply(lambda x: len(str(x)) if x else 0)
-    df['company_maturity'] = df.apply(lambda row: analyze_company_maturity(row.get('description', ''), row.get('founded', '')), axis=1)
+    founded = df['founded'] if 'founded' in df.columns else pd.Series('', index=df.index)
+    features = pd.DataFrame([
+        cached_analysis(description, year) for description, year in zip(df['description'], founded)
+    ], index=df.index)
+    for column in features.columns:
+        df[column] = features[column]
     
     # Enhanced size categorization
     if 'size' in df.columns:
         df['size_category'] = df['size'].apply(extract_company_size_category)
     
-    # Add word count and readability metrics
-    df['word_count'] = df['description'].apply(lambda x: len(str(x).split()) if x else 0)
-    df['sentence_count'] = df['description'].apply(lambda x: len(re.split(r'[.!?]+', str(x))) if x else 0)
-    df['avg_words_per_sentence'] = df.apply(lambda row: row['word_count'] / max(row['sentence_count'], 1), axis=1)
-    
     logger.info("Enhanced NLP processing completed")
     return df
 
@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.environ.get('PAGE_CACHE_DIR', os.path.join('.cache', 'pages'))
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+class PageCache:
+    """
+    Content-addressed on-disk cache for fetched HTML.
+
+    Entries are keyed by the SHA-256 of the URL and stored zlib-compressed, one
+    file per page. Reads past ``ttl_seconds`` are misses; once the directory
+    grows past ``max_bytes`` the least recently used entries (by mtime, which
+    is bumped on every hit) are evicted.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256((url or '').strip().encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f'{key}.page')
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached entry (url, status_code, final_url, fetched_at, text) or None"""
+        path = self._path(self.key(url))
+        try:
+            with open(path, 'rb') as f:
+                entry = json.loads(zlib.decompress(f.read()).decode('utf-8'))
+        except FileNotFoundError:
+            self._count_miss()
+            return None
+        except Exception as e:
+            logger.debug(f"[PageCache] Dropping unreadable entry for {url}: {e}")
+            self._remove(path)
+            self._count_miss()
+            return None
+
+        if time.time() - entry.get('fetched_at', 0) > self.ttl_seconds:
+            self._remove(path)
+            self._count_miss()
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used for LRU eviction
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, url: str, text: str, status_code: int = 200, final_url: Optional[str] = None) -> None:
+        entry = {
+            'url': url,
+            'status_code': status_code,
+            'final_url': final_url or url,
+            'fetched_at': time.time(),
+            'text': text
+        }
+        payload = zlib.compress(json.dumps(entry).encode('utf-8'), 6)
+        path = self._path(self.key(url))
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"[PageCache] Could not write {url}: {e}")
+            self._remove(tmp_path)
+            return
+
+        with self._lock:
+            self.writes += 1
+            if self._total_bytes is not None:
+                self._total_bytes += len(payload) - previous
+        self._evict_if_needed()
+
+    def _count_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _scan(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.page'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict_if_needed(self) -> None:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            if self._total_bytes <= self.max_bytes:
+                return
+            # Evict down to 90% so we don't rescan on every write at the limit
+            entries = sorted(self._scan())
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * 0.9)
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                self._remove(path)
+                total -= size
+                self.evictions += 1
+            self._total_bytes = total
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+_cache: Optional[PageCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_page_cache(config: Optional[Dict] = None) -> Optional[PageCache]:
+    """
+    Process-wide cache built from the 'page_cache' section of scraper_config.json.
+    Returns None when caching is disabled.
+    """
+    global _cache
+    config = config or {}
+    if not config.get('enabled', True):
+        return None
+    directory = config.get('directory') or DEFAULT_CACHE_DIR
+    ttl_seconds = float(config.get('ttl_hours', DEFAULT_TTL_SECONDS / 3600)) * 3600
+    max_bytes = int(float(config.get('max_mb', DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024)
+    with _cache_lock:
+        if _cache is None or _cache.directory != directory:
+            _cache = PageCache(directory, ttl_seconds, max_bytes)
+        else:
+            _cache.ttl_seconds = ttl_seconds
+            _cache.max_bytes = max_bytes
+        return _cache
@@ -0,0 +1,142 @@
+import time
+import logging
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 1.0   # requests per second per host
+DEFAULT_BURST = 1
+
+
+def host_key(url: str) -> str:
+    """
+    Normalize a URL to the host used for rate accounting; every LinkedIn
+    subdomain (uk., www., ...) shares one budget
+    """
+    netloc = urlparse(url if '//' in (url or '') else f'//{url}').netloc.lower()
+    netloc = netloc.split('@')[-1].split(':')[0]
+    if netloc == 'linkedin.com' or netloc.endswith('.linkedin.com'):
+        return 'linkedin.com'
+    return netloc[4:] if netloc.startswith('www.') else netloc
+
+
+class TokenBucket:
+    """
+    Classic token bucket. ``reserve`` always takes a token and returns how long
+    the caller must wait for it, so concurrent callers queue up in order
+    instead of polling.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        self.rate = max(float(rate), 1e-6)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class HostRateLimiter:
+    """
+    Per-host token buckets. Hosts without an explicit limit share the default
+    rate but get their own bucket, so waiting on one site never delays another.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict]] = None, default: Optional[Dict] = None):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.limits: Dict[str, Dict] = {}
+        self.default: Dict = {'rate': DEFAULT_RATE, 'burst': DEFAULT_BURST}
+        self.configure(limits, default)
+
+    def configure(self, limits: Optional[Dict[str, Dict]] = None, default: Optional[Dict] = None) -> None:
+        """
+        Replace the configured limits. Buckets are rebuilt lazily, and only when
+        the limits actually change. Every user of a shared limiter sees the
+        change, so per-run settings belong in ``with_default`` instead.
+        """
+        limits = dict(limits or {})
+        with self._lock:
+            new_default = self.default
+            if default is not None or 'default' in limits:
+                new_default = dict(limits.get('default') or default)
+            limits.pop('default', None)
+            new_limits = {host_key(host): dict(spec) for host, spec in limits.items()}
+            if new_default == self.default and new_limits == self.limits:
+                return
+            self.default = new_default
+            self.limits = new_limits
+            self._buckets.clear()
+
+    def _spec_for(self, host: str) -> Dict:
+        # Match "example.com" limits for "shop.example.com" as well
+        parts = host.split('.')
+        for i in range(len(parts) - 1):
+            spec = self.limits.get('.'.join(parts[i:]))
+            if spec:
+                return spec
+        return self.default
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = host_key(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                spec = self._spec_for(host)
+                bucket = TokenBucket(spec.get('rate', DEFAULT_RATE), spec.get('burst', DEFAULT_BURST))
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """Block until ``url``'s host has budget; returns the seconds waited"""
+        delay = self.bucket(url).reserve()
+        if delay > 0:
+            logger.debug(f"Rate limiting {host_key(url)} for {delay:.2f}s")
+            time.sleep(delay)
+        return delay
+
+    def with_default(self, default: Dict) -> 'RunRateLimiter':
+        """This limiter plus a run's own, possibly stricter, per-host spacing"""
+        return RunRateLimiter(self, default)
+
+
+class RunRateLimiter:
+    """
+    Per-run politeness on top of a shared HostRateLimiter. Every request waits
+    for the shared host budget and then for this run's own bucket for the host,
+    so a run can go slower than the shared limits but never faster, and it
+    never changes the buckets other runs are using.
+    """
+
+    def __init__(self, shared: HostRateLimiter, default: Dict):
+        self.shared = shared
+        self.local = HostRateLimiter(default=default)
+
+    def acquire(self, url: str) -> float:
+        return self.shared.acquire(url) + self.local.acquire(url)
+
+
+_limiter: Optional[HostRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter(limits: Optional[Dict[str, Dict]] = None, default: Optional[Dict] = None) -> HostRateLimiter:
+    """
+    Process-wide limiter shared by every scrape running in this process. It is
+    configured once, from the ``limits`` and ``default`` of the first call;
+    later arguments are ignored so a run can't reset the budgets of another.
+    """
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = HostRateLimiter(limits, default)
+        return _limiter
@@ -0,0 +1,168 @@
+import os
+import csv
+import json
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_DIR = os.environ.get('SCRAPE_OUTPUT_DIR', os.path.join('instance', 'outputs'))
+OUTPUT_FORMATS = ('csv', 'jsonl')
+
+
+def job_output_path(job_id: str, fmt: str = 'csv', directory: Optional[str] = None) -> str:
+    """Where the finished output of scrape job ``job_id`` is stored"""
+    if not job_id or not all(c.isalnum() or c in '-_' for c in job_id):
+        raise ValueError(f"Invalid job id: {job_id!r}")
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}; expected one of {', '.join(OUTPUT_FORMATS)}")
+    return os.path.join(directory or OUTPUT_DIR, f'{job_id}.{fmt}')
+
+
+class RecordSink:
+    """
+    Receives scraped companies one at a time as they complete.
+
+    ``write`` may be called many times, then exactly one of ``close`` (the run
+    finished, publish the output) or ``abort`` (the run crashed, discard it).
+    Used as a context manager, an exception aborts and a clean exit closes.
+    """
+
+    def write(self, record: Dict) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def abort(self) -> None:
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class _FileSink(RecordSink):
+    """
+    Streams records into ``<path>.part`` and renames it over ``path`` on close,
+    so readers only ever see a complete file (or the previous one)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.part_path = f'{path}.part'
+        self.count = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _open(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.part_path, 'w', encoding='utf-8', newline='')
+
+    def _write(self, record: Dict) -> None:
+        raise NotImplementedError
+
+    def write(self, record: Dict) -> None:
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._write(record)
+            # Flushed per record: memory stays flat and a crash loses at most one row
+            self._file.flush()
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                self._open()
+                self._write_empty()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self.part_path, self.path)
+            self._file = None
+        logger.info(f"Wrote {self.count} records to {self.path}")
+
+    def abort(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            try:
+                os.remove(self.part_path)
+            except OSError:
+                pass
+
+    def _write_empty(self) -> None:
+        pass
+
+
+class CSVSink(_FileSink):
+    """
+    CSV output. The header is ``columns`` followed by any other keys of the first
+    record; later records fill missing columns with '' and extra keys are dropped.
+    """
+
+    def __init__(self, path: str, columns: Sequence[str] = ()):
+        super().__init__(path)
+        self.columns: List[str] = list(columns)
+        self._writer = None
+
+    def _start(self, record: Optional[Dict]) -> None:
+        fieldnames = self.columns + [key for key in (record or {}) if key not in self.columns]
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, restval='', extrasaction='ignore')
+        self._writer.writeheader()
+
+    def _write(self, record: Dict) -> None:
+        if self._writer is None:
+            self._start(record)
+        self._writer.writerow({key: '' if value is None else value for key, value in record.items()})
+
+    def _write_empty(self) -> None:
+        if self.columns:
+            self._start(None)
+
+
+class JSONLinesSink(_FileSink):
+    """JSON Lines output, one company per line"""
+
+    def _write(self, record: Dict) -> None:
+        self._file.write(json.dumps(record, default=str) + '\n')
+
+
+class MultiSink(RecordSink):
+    """Fans every record out to several sinks"""
+
+    def __init__(self, sinks: Iterable[RecordSink]):
+        self.sinks = list(sinks)
+
+    def write(self, record: Dict) -> None:
+        for sink in self.sinks:
+            sink.write(record)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+    def abort(self) -> None:
+        for sink in self.sinks:
+            try:
+                sink.abort()
+            except Exception as e:
+                logger.warning(f"Could not abort {type(sink).__name__}: {e}")
+
+
+def open_file_sink(path: str, columns: Sequence[str] = ()) -> RecordSink:
+    """CSV or JSON Lines sink chosen by the file extension"""
+    if path.endswith('.jsonl'):
+        return JSONLinesSink(path)
+    return CSVSink(path, columns)
@@ -0,0 +1,117 @@
+import time
+import random
+import logging
+import threading
+from typing import Any, Callable, NamedTuple, Optional, Sequence, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy(NamedTuple):
+    """How often and how patiently one class of failure is retried"""
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the wait after ``attempt`` (1-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of recent traffic so a failing dependency is
+    never hit with a retry storm. Every first attempt deposits ``ratio`` of a
+    token, the budget also refills ``min_per_second`` tokens a second so rare
+    calls can still retry, and each retry spends one token.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 0.5, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.max_tokens, self.tokens + (now - self.updated) * self.min_per_second)
+        self.updated = now
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class Retrier:
+    """
+    Runs an operation with per-error-class retry policies, a shared retry
+    budget and an optional deadline.
+
+    ``rules`` is an ordered list of (exception classes, policy); the first
+    match decides, and exceptions matching no rule (or a rule whose policy is
+    None) are raised at once. A ``retry_result`` predicate retries on returned
+    values too (status codes, error dicts) using ``result_policy``; when
+    retries run out the last result is returned unchanged, so callers keep
+    their usual return conventions.
+    """
+
+    def __init__(self, name: str, rules: Sequence[Tuple[Tuple[Type[BaseException], ...], Optional[RetryPolicy]]] = (),
+                 result_policy: Optional[RetryPolicy] = None, budget: Optional[RetryBudget] = None,
+                 deadline: Optional[float] = None):
+        self.name = name
+        self.rules = list(rules)
+        self.result_policy = result_policy or RetryPolicy()
+        self.budget = budget if budget is not None else RetryBudget()
+        self.deadline = deadline
+        self.retries = 0
+
+    def policy_for(self, error: BaseException) -> Optional[RetryPolicy]:
+        for error_types, policy in self.rules:
+            if isinstance(error, error_types):
+                return policy
+        return None
+
+    def run(self, operation: Callable[[], Any], retry_result: Optional[Callable[[Any], bool]] = None,
+            deadline: Optional[float] = None, description: str = '') -> Any:
+        """Call ``operation()`` until it succeeds, fails permanently or retries run out"""
+        deadline = self.deadline if deadline is None else deadline
+        give_up_at = None if deadline is None else time.monotonic() + deadline
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            attempt += 1
+            error = None
+            try:
+                result = operation()
+            except Exception as e:
+                error = e
+                policy = self.policy_for(e)
+                if policy is None:
+                    raise
+            else:
+                if retry_result is None or not retry_result(result):
+                    return result
+                policy = self.result_policy
+
+            delay = policy.delay(attempt)
+            out_of_time = give_up_at is not None and time.monotonic() + delay > give_up_at
+            if attempt >= policy.max_attempts or out_of_time or not self.budget.withdraw():
+                if error is not None:
+                    raise error
+                return result
+
+            self.retries += 1
+            logger.info(f"[Retry] {self.name} {description} attempt {attempt} failed "
+                        f"({error if error is not None else 'retryable result'}); retrying in {delay:.2f}s")
+            time.sleep(delay)
@@ -0,0 +1,107 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.environ.get('SEARCH_CACHE_DIR', os.path.join('.cache', 'search'))
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+
+class SearchCache:
+    """
+    Query-keyed on-disk cache of search result URLs.
+
+    Each entry remembers the URLs found so far, the result offset the next page
+    should start from and whether the search ran out of results, so a wider
+    repeat of a query only fetches the new tail. Expired entries are still
+    returned by ``load`` (flagged as stale) to serve as a fallback when the
+    search engine fails.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return ' '.join((query or '').lower().split())
+
+    def _path(self, query: str) -> str:
+        key = hashlib.sha256(self.normalize(query).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{key}.json')
+
+    def load(self, query: str) -> Optional[Dict]:
+        """
+        Return the entry (query, urls, next_offset, exhausted, fetched_at, stale)
+        or None if the query was never cached
+        """
+        try:
+            with open(self._path(query), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"[SearchCache] Ignoring unreadable entry for {query!r}: {e}")
+            return None
+        entry['stale'] = time.time() - entry.get('fetched_at', 0) > self.ttl_seconds
+        return entry
+
+    def save(self, query: str, urls: List[str], next_offset: int, exhausted: bool = False) -> None:
+        entry = {
+            'query': self.normalize(query),
+            'urls': urls,
+            'next_offset': next_offset,
+            'exhausted': exhausted,
+            'fetched_at': time.time()
+        }
+        path = self._path(query)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"[SearchCache] Could not write {query!r}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+_cache: Optional[SearchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache(config: Optional[Dict] = None) -> Optional[SearchCache]:
+    """
+    Process-wide cache built from the 'search_cache' section of scraper_config.json.
+    Returns None when caching is disabled.
+    """
+    global _cache
+    config = config or {}
+    if not config.get('enabled', True):
+        return None
+    directory = config.get('directory') or DEFAULT_CACHE_DIR
+    ttl_seconds = float(config.get('ttl_hours', DEFAULT_TTL_SECONDS / 3600)) * 3600
+    with _cache_lock:
+        if _cache is None or _cache.directory != directory:
+            _cache = SearchCache(directory, ttl_seconds)
+        else:
+            _cache.ttl_seconds = ttl_seconds
+        return _cache
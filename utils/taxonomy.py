@@ -0,0 +1,376 @@
+import os
+import re
+import json
+import hashlib
+import time
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Industry taxonomy used by classify_domain, kept in a versioned JSON file so it
+# can be tuned without a deploy. Every indicator is matched as a plain
+# substring of the lowercased text:
+#   primary    business activities, matched in the description
+#   secondary  broader terms, matched in the description or (weaker) the domain/name
+#   context    words that confirm an industry, matched in the description
+# general_categories are the keyword lists tried when no industry scores high enough.
+# The default is the file next to leads.py, wherever the process was started from.
+TAXONOMY_PATH = os.environ.get('TAXONOMY_PATH', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'industry_taxonomy.json'))
+# How often a process checks the file for changes
+TAXONOMY_CHECK_SECONDS = float(os.environ.get('TAXONOMY_CHECK_SECONDS', 5))
+
+# Scoring weights; see TaxonomyMatcher.score
+PRIMARY_WEIGHT = 10
+MULTIWORD_BONUS = 5
+SECONDARY_WEIGHT = 5
+NAME_WEIGHT = 2
+CONTEXT_WEIGHT = 3
+NAME_ONLY_PENALTY = 5
+MIN_INDUSTRY_SCORE = 8
+GENERAL_PRIMARY_WEIGHT = 3
+GENERAL_SECONDARY_WEIGHT = 1
+MIN_GENERAL_SCORE = 5
+FALLBACK_CATEGORY = 'Other'
+# classification_confidence grows with the winner's lead over the runner-up;
+# a lead of this many points with nothing else scoring gives 50
+CONFIDENCE_HALF_SCORE = 10
+# Best-scoring industries kept with a classification (Company.industry_tags)
+TOP_INDUSTRIES = 3
+
+PRIMARY, SECONDARY, CONTEXT, GENERAL = 'primary', 'secondary', 'context', 'general'
+
+
+def confidence_from_score(score: float, runner_up: float = 0) -> int:
+    """
+    0-100 confidence for a winning category score: its margin over the best
+    competing category, damped while the evidence is thin. A tie gives 0, and
+    an unopposed score of 10 (one primary indicator) gives 50, 40 gives 80.
+    """
+    if score <= 0:
+        return 0
+    return int(100 * max(0, score - runner_up) / (score + CONFIDENCE_HALF_SCORE))
+
+
+def industry_tags_json(top_industries: Iterable[Tuple[str, int]]) -> str:
+    """
+    Company.industry_tags format: a JSON object of industry -> score, best
+    first. A tag is found with a LIKE on '"<industry>":'.
+    """
+    return json.dumps({industry: int(score) for industry, score in top_industries})
+
+
+class Classification(NamedTuple):
+    """Outcome of classifying one company"""
+    label: str
+    score: int  # score of the winning category, 0 for the fallback
+    confidence: int
+    top_industries: List[Tuple[str, int]]  # best industries with a positive score, best first
+
+    @property
+    def industry_tags(self) -> str:
+        return industry_tags_json(self.top_industries)
+
+    @classmethod
+    def from_value(cls, value) -> 'Classification':
+        """Rebuild from the JSON form of a Classification (a 4-item list)"""
+        label, score, confidence, top_industries = value
+        return cls(label, score, confidence, [tuple(item) for item in top_industries])
+
+
+def _trie_regex(patterns: Iterable[str]) -> str:
+    """
+    Regex alternation of ``patterns`` factored into a trie, so the engine walks
+    shared prefixes once. Greedy optional groups make it prefer the longest
+    pattern that matches at a position.
+    """
+    trie: Dict = {}
+    for pattern in patterns:
+        node = trie
+        for char in pattern:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class PatternMatcher:
+    """
+    Finds which of many patterns occur anywhere in a text, with the same result
+    as testing ``pattern in text`` for each one, in a single regex scan.
+
+    A lookahead of the trie regex is tried at every position and reports the
+    longest pattern starting there; every shorter pattern starting at the same
+    position is one of its prefixes, which are precomputed.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = sorted(set(patterns))
+        index = {pattern: i for i, pattern in enumerate(self.patterns)}
+        self._prefix_ids: Dict[str, Tuple[int, ...]] = {
+            pattern: tuple(index[pattern[:end]] for end in range(1, len(pattern) + 1) if pattern[:end] in index)
+            for pattern in self.patterns
+        }
+        self._regex = re.compile('(?=(' + _trie_regex(self.patterns) + '))') if self.patterns else None
+
+    def find(self, text: str) -> Set[int]:
+        """Indexes (into ``patterns``) of every pattern that occurs in ``text``"""
+        found: Set[int] = set()
+        if not text or self._regex is None:
+            return found
+        for longest in set(self._regex.findall(text)):
+            if longest:
+                found.update(self._prefix_ids[longest])
+        return found
+
+
+def load_taxonomy(path: str = TAXONOMY_PATH) -> Dict[str, Any]:
+    """
+    Read and validate a taxonomy file. Indicators are lowercased, as the texts
+    they are matched against are. Raises ValueError if the file is unusable.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read taxonomy {path}: {e}")
+    if not isinstance(data, dict) or data.get('version') in (None, ''):
+        raise ValueError(f"Taxonomy {path} must be an object with a version")
+
+    def indicators(value, where):
+        if not isinstance(value, list) or not all(isinstance(item, str) and item.strip() for item in value):
+            raise ValueError(f"Taxonomy {path}: {where} must be a list of non-empty strings")
+        return [item.lower() for item in value]
+
+    industry_categories = {}
+    for name, roles in (data.get('industry_categories') or {}).items():
+        if not isinstance(roles, dict):
+            raise ValueError(f"Taxonomy {path}: industry {name!r} must be an object")
+        industry_categories[name] = {
+            role: indicators(roles.get(role, []), f"{name}.{role}") for role in (PRIMARY, SECONDARY, CONTEXT)
+        }
+    general_categories = {
+        name: indicators(keywords, name) for name, keywords in (data.get('general_categories') or {}).items()
+    }
+    if not industry_categories and not general_categories:
+        raise ValueError(f"Taxonomy {path} defines no categories")
+    return {'version': data['version'], 'industry_categories': industry_categories,
+            'general_categories': general_categories}
+
+
+class TaxonomyMatcher:
+    """
+    A taxonomy compiled once. ``classify`` scans the description and the
+    domain/name text once each with a PatternMatcher and then only scores the
+    categories that have a matching indicator.
+    """
+
+    def __init__(self, industry_categories: Dict[str, Dict[str, List[str]]],
+                 general_categories: Dict[str, List[str]], version: Any = None, source: Optional[str] = None):
+        self.industry_categories = industry_categories
+        self.general_categories = general_categories
+        self.version = version
+        self.source = source
+        self.loaded_at = time.time()
+        # Changes whenever the categories or the scoring weights do, even if the
+        # file's version was not bumped; it keys memoized classifications
+        self.fingerprint = hashlib.sha256(json.dumps([
+            industry_categories, general_categories,
+            [PRIMARY_WEIGHT, MULTIWORD_BONUS, SECONDARY_WEIGHT, NAME_WEIGHT, CONTEXT_WEIGHT, NAME_ONLY_PENALTY,
+             MIN_INDUSTRY_SCORE, GENERAL_PRIMARY_WEIGHT, GENERAL_SECONDARY_WEIGHT, MIN_GENERAL_SCORE,
+             FALLBACK_CATEGORY, CONFIDENCE_HALF_SCORE, TOP_INDUSTRIES]
+        ]).encode('utf-8')).hexdigest()[:16]
+        self.industries = list(self.industry_categories)
+        self.generals = list(self.general_categories)
+        patterns = {indicator for data in self.industry_categories.values() for role in (PRIMARY, SECONDARY, CONTEXT)
+                    for indicator in data.get(role, ())}
+        patterns.update(keyword for keywords in self.general_categories.values() for keyword in keywords)
+        self.matcher = PatternMatcher(patterns)
+        index = {pattern: i for i, pattern in enumerate(self.matcher.patterns)}
+        # pattern index -> [(role, category index, times listed)]; a pattern listed
+        # twice in one role counts twice, as it did when each entry was tested
+        postings: Dict[int, Dict[Tuple[str, int], int]] = {}
+        for category_index, data in enumerate(self.industry_categories.values()):
+            for role in (PRIMARY, SECONDARY, CONTEXT):
+                for indicator in data.get(role, ()):
+                    key = (role, category_index)
+                    postings.setdefault(index[indicator], {})
+                    postings[index[indicator]][key] = postings[index[indicator]].get(key, 0) + 1
+        for category_index, keywords in enumerate(self.general_categories.values()):
+            for keyword in keywords:
+                key = (GENERAL, category_index)
+                postings.setdefault(index[keyword], {})
+                postings[index[keyword]][key] = postings[index[keyword]].get(key, 0) + 1
+        self._postings = {i: [(role, category, count) for (role, category), count in entries.items()]
+                          for i, entries in postings.items()}
+        self._multiword = [len(pattern.split()) > 1 for pattern in self.matcher.patterns]
+
+    def score(self, primary_text: str, secondary_text: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Return ({industry: score > 0}, {general category: score > 0}) in taxonomy order.
+
+        Industry score: 10 per primary indicator in the description (+5 if it has
+        several words), 5 per secondary indicator in the description or else 2 if
+        it is in the domain/name, 3 per context word in the description; 5 is
+        taken off (not below 0) when only domain/name matches support it.
+        General score: 3 per keyword in the description, else 1 if in the domain/name.
+        """
+        in_primary = self.matcher.find(primary_text)
+        in_secondary = self.matcher.find(secondary_text)
+        scores: Dict[int, int] = {}
+        name_only: Dict[int, int] = {}
+        business: Dict[int, int] = {}
+        general: Dict[int, int] = {}
+        for pattern_index in in_primary | in_secondary:
+            primary_hit = pattern_index in in_primary
+            for role, category, count in self._postings.get(pattern_index, ()):
+                if role == GENERAL:
+                    weight = GENERAL_PRIMARY_WEIGHT if primary_hit else GENERAL_SECONDARY_WEIGHT
+                    general[category] = general.get(category, 0) + weight * count
+                elif role == SECONDARY:
+                    if primary_hit:
+                        scores[category] = scores.get(category, 0) + SECONDARY_WEIGHT * count
+                    else:
+                        scores[category] = scores.get(category, 0) + NAME_WEIGHT * count
+                        name_only[category] = name_only.get(category, 0) + count
+                elif primary_hit:
+                    if role == PRIMARY:
+                        weight = PRIMARY_WEIGHT + (MULTIWORD_BONUS if self._multiword[pattern_index] else 0)
+                        business[category] = business.get(category, 0) + count
+                    else:
+                        weight = CONTEXT_WEIGHT
+                    scores[category] = scores.get(category, 0) + weight * count
+        for category in name_only:
+            if not business.get(category):
+                scores[category] = max(0, scores.get(category, 0) - NAME_ONLY_PENALTY)
+        industry_scores = {self.industries[c]: scores[c] for c in sorted(scores) if scores[c] > 0}
+        general_scores = {self.generals[c]: general[c] for c in sorted(general) if general[c] > 0}
+        return industry_scores, general_scores
+
+    def classify_company(self, domain: str, company_name: str = '', description: str = '',
+                         top_k: int = TOP_INDUSTRIES) -> Classification:
+        """
+        Label, winning score, confidence and the ``top_k`` best industries,
+        all from one scoring pass
+        """
+        primary_text = (description or '').lower()
+        secondary_text = f"{(domain or '').lower()} {(company_name or '').lower()}"
+        industry_scores, general_scores = self.score(primary_text, secondary_text)
+        # Stable sort: equal scores keep taxonomy order, so the first listed wins a tie
+        ranked = sorted(industry_scores.items(), key=lambda item: -item[1])
+        top_industries = ranked[:top_k]
+
+        # Best industry if it clears the threshold
+        if ranked and ranked[0][1] >= MIN_INDUSTRY_SCORE:
+            industry_name, industry_score = ranked[0]
+            runner_up = ranked[1][1] if len(ranked) > 1 else 0
+            logger.debug(f"Classified as {industry_name} (score: {industry_score}, runner-up: {runner_up})")
+            return Classification(industry_name, industry_score, confidence_from_score(industry_score, runner_up),
+                                  top_industries)
+
+        for category, category_score in general_scores.items():
+            if category_score >= MIN_GENERAL_SCORE:
+                runner_up = max((score for other, score in general_scores.items() if other != category), default=0)
+                logger.debug(f"General classification: {category} (score: {category_score}, runner-up: {runner_up})")
+                return Classification(category, category_score, confidence_from_score(category_score, runner_up),
+                                      top_industries)
+
+        logger.debug(f"No classification found - returning '{FALLBACK_CATEGORY}'")
+        return Classification(FALLBACK_CATEGORY, 0, 0, top_industries)
+
+    def classify(self, domain: str, company_name: str = '', description: str = '') -> str:
+        return self.classify_company(domain, company_name, description).label
+
+    @classmethod
+    def from_file(cls, path: str = TAXONOMY_PATH) -> 'TaxonomyMatcher':
+        data = load_taxonomy(path)
+        return cls(data['industry_categories'], data['general_categories'], version=data['version'], source=path)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'source': self.source,
+            'industries': len(self.industries),
+            'general_categories': len(self.generals),
+            'indicators': len(self.matcher.patterns),
+            'fingerprint': self.fingerprint,
+            'loaded_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.loaded_at))
+        }
+
+
+_matcher: Optional[TaxonomyMatcher] = None
+_matcher_mtime: Optional[float] = None
+_next_check = 0.0
+_matcher_lock = threading.Lock()
+
+
+def _file_mtime(path: str) -> Optional[float]:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def reload_taxonomy(path: str = TAXONOMY_PATH) -> TaxonomyMatcher:
+    """
+    Compile the taxonomy file and swap it in for every later classification.
+    Raises ValueError (keeping the current taxonomy) if the file is unusable.
+    """
+    global _matcher, _matcher_mtime
+    with _matcher_lock:
+        mtime = _file_mtime(path)
+        started = time.perf_counter()
+        matcher = TaxonomyMatcher.from_file(path)
+        previous = _matcher.version if _matcher is not None else None
+        # A single reference assignment: classifications in flight keep the matcher they started with
+        _matcher, _matcher_mtime = matcher, mtime
+    logger.info(f"Loaded taxonomy version {matcher.version} from {path} (previous: {previous}) "
+                f"in {time.perf_counter() - started:.3f}s")
+    return matcher
+
+
+def get_taxonomy_matcher() -> TaxonomyMatcher:
+    """
+    The process-wide compiled taxonomy, loaded on first use. Every
+    TAXONOMY_CHECK_SECONDS the file's mtime is checked and a changed file is
+    compiled and swapped in; a broken edit is logged and the old index kept.
+    If the file cannot be loaded at all, an empty taxonomy stands in (every
+    company is FALLBACK_CATEGORY) until it can, rather than failing scrapes.
+    """
+    global _matcher, _next_check, _matcher_mtime
+    if _matcher is None:
+        try:
+            return reload_taxonomy()
+        except ValueError as e:
+            logger.error(f"Classifying every company as '{FALLBACK_CATEGORY}' until the taxonomy loads: {e}")
+            with _matcher_lock:
+                if _matcher is None:
+                    _matcher = TaxonomyMatcher({}, {}, source=TAXONOMY_PATH)
+                    # A file that exists but is broken is retried once it changes
+                    _matcher_mtime = _file_mtime(TAXONOMY_PATH)
+                    _next_check = time.monotonic() + TAXONOMY_CHECK_SECONDS
+            return _matcher
+    now = time.monotonic()
+    if now >= _next_check:
+        _next_check = now + TAXONOMY_CHECK_SECONDS
+        mtime = _file_mtime(_matcher.source or TAXONOMY_PATH)
+        if mtime is not None and mtime != _matcher_mtime:
+            try:
+                return reload_taxonomy(_matcher.source or TAXONOMY_PATH)
+            except ValueError as e:
+                logger.error(f"Keeping taxonomy version {_matcher.version}: {e}")
+                # Do not retry the same broken file on every check
+                _matcher_mtime = mtime
+    return _matcher
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+import sys
+import logging
+import argparse
+
+from app import app
+from jobs import run_worker, POLL_INTERVAL
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Background worker that executes queued scrape jobs')
+    parser.add_argument('--poll_interval', type=float, default=POLL_INTERVAL, help='Seconds between queue polls when idle')
+    parser.add_argument('--once', action='store_true', help='Exit once the queue is empty')
+    args = parser.parse_args()
+    run_worker(app, poll_interval=args.poll_interval, once=args.once)